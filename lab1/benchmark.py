@@ -0,0 +1,131 @@
+"""Замеры скорости алгоритмов построения отрезков без Tk.
+
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json --threshold 10
+
+Для каждого алгоритма и набора параметров (наклон, длина, размер пакета)
+выводятся пиксели в секунду и пиковая память; результаты можно сохранить
+как базовую линию и сравнивать с ней последующие версии.
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from rasterizer import bresenham_batch, bresenham_runs, dda_batch, wu_batch
+
+SLOPES = (0.0, 0.25, 1.0, 4.0)
+LENGTHS = (16, 256, 4096)
+BATCH_SIZES = (1, 100, 10000)
+
+
+def count_dda(segments):
+    return len(dda_batch(segments)[0])
+
+
+def count_bresenham(segments):
+    return len(bresenham_batch(segments)[0])
+
+
+def count_runs(segments):
+    return int(bresenham_runs(segments)[2].sum())
+
+
+def count_wu(segments):
+    return len(wu_batch(segments)[0])
+
+
+ALGORITHMS = {
+    "DDA": count_dda,
+    "Bresenham": count_bresenham,
+    "Bresenham Runs": count_runs,
+    "Wu": count_wu,
+}
+
+
+def make_segments(slope, length, batch, seed=0):
+    """Пакет отрезков одной длины и наклона со случайными началами"""
+    rng = np.random.default_rng(seed)
+    angle = math.atan(slope)
+    start = rng.uniform(0, 1000, size=(batch, 2))
+    end = start + length * np.array([math.cos(angle), math.sin(angle)])
+    return np.rint(np.hstack([start, end]))
+
+
+def measure(fn, segments, min_time=0.2):
+    """Пиксели в секунду (лучший из повторов) и пиковая память одного вызова"""
+    tracemalloc.start()
+    pixels = fn(segments)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = float("inf")
+    total = 0.0
+    while total < min_time:
+        start = time.perf_counter()
+        fn(segments)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+    return pixels / best, peak
+
+
+def run_suite(min_time=0.2):
+    results = {}
+    for name, fn in ALGORITHMS.items():
+        for slope in SLOPES:
+            for length in LENGTHS:
+                for batch in BATCH_SIZES:
+                    if length * batch > 4_000_000:
+                        continue
+                    key = f"{name}|slope={slope}|length={length}|batch={batch}"
+                    rate, peak = measure(fn, make_segments(slope, length, batch), min_time)
+                    results[key] = {"pixels_per_second": rate, "peak_bytes": peak}
+                    print(f"{key:<50} {rate / 1e6:10.2f} Mpx/s {peak / 2**20:10.2f} MiB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Список случаев, где скорость упала больше чем на threshold процентов"""
+    regressions = []
+    for key, old in baseline["results"].items():
+        new = results.get(key)
+        if new is None:
+            continue
+        change = 100 * (new["pixels_per_second"] / old["pixels_per_second"] - 1)
+        if change < -threshold:
+            regressions.append((key, change))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замеры алгоритмов построения отрезков")
+    parser.add_argument("--save", help="сохранить результаты как базовую линию (JSON)")
+    parser.add_argument("--compare", help="сравнить с сохранённой базовой линией (JSON)")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="допустимое падение скорости, проценты")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="минимальное время замера одного случая, секунды")
+    args = parser.parse_args()
+
+    results = run_suite(args.min_time)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "numpy": np.__version__,
+                       "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for key, change in regressions:
+            print(f"REGRESSION {key}: {change:+.1f}%")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold}%")
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+def liang_barsky(segments, viewport):
+    """Отсечение Лианга-Барски сразу для всех отрезков.
+
+    viewport = (xmin, ymin, xmax, ymax). Возвращает параметры t0, t1 видимой
+    части каждого отрезка и маску видимых отрезков; полностью невидимые
+    отбрасываются одной векторной операцией.
+    """
+    xmin, ymin, xmax, ymax = viewport
+    x1, y1, x2, y2 = np.asarray(segments, dtype=float).reshape(-1, 4).T
+    dx = x2 - x1
+    dy = y2 - y1
+
+    t0 = np.zeros(len(x1))
+    t1 = np.ones(len(x1))
+    visible = np.ones(len(x1), dtype=bool)
+    for p, q in ((-dx, x1 - xmin), (dx, xmax - x1), (-dy, y1 - ymin), (dy, ymax - y1)):
+        parallel = p == 0
+        visible &= ~(parallel & (q < 0))
+        r = np.divide(q, p, out=np.zeros_like(q), where=~parallel)
+        t0 = np.where(p < 0, np.maximum(t0, r), t0)
+        t1 = np.where(p > 0, np.minimum(t1, r), t1)
+    visible &= t0 <= t1
+    return t0, t1, visible
+
+
+def expand_viewport(viewport, margin=1):
+    xmin, ymin, xmax, ymax = viewport
+    return xmin - margin, ymin - margin, xmax + margin, ymax + margin
+
+
+def visible_steps(segments, origin, span, count, viewport):
+    """Диапазон шагов [first, last] растеризатора, которые могут попасть в окно.
+
+    Шаг i растеризатора соответствует координате origin + i по основной оси,
+    span - приращение этой координаты вдоль всего отрезка, count - число шагов.
+    Отсечение идёт по окну, расширенному на пиксель, с запасом в шаг с каждой
+    стороны, поэтому видимые пиксели совпадают с растеризацией без отсечения.
+    """
+    t0, t1, visible = liang_barsky(segments, expand_viewport(viewport))
+    first = np.floor(t0 * span - origin).astype(np.int64) - 1
+    last = np.ceil(t1 * span - origin).astype(np.int64) + 1
+    first = np.clip(first, 0, count - 1)
+    last = np.clip(last, -1, count - 1)
+    last = np.where(visible, last, first - 1)
+    return first, last
+
+
+def inside(xs, ys, viewport):
+    """Маска пикселей внутри окна (границы включительно)"""
+    xmin, ymin, xmax, ymax = viewport
+    return (xs >= xmin) & (xs <= xmax) & (ys >= ymin) & (ys <= ymax)
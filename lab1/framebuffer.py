@@ -0,0 +1,92 @@
+import tkinter as tk
+
+import numpy as np
+
+GAMMA = 2.2
+
+
+def gamma_lut(gamma=GAMMA):
+    """Таблица из 256 значений: покрытие (0..255) -> яркость пикселя с гамма-коррекцией"""
+    coverage = np.arange(256) / 255
+    return np.round(255 * (1 - coverage) ** (1 / gamma)).astype(np.uint8)
+
+
+class FrameBuffer:
+    """Внеэкранный растр в оттенках серого, выводимый на холст одним PhotoImage"""
+
+    def __init__(self, width, height, background=255):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.pixels = np.full((height, width), background, dtype=np.uint8)
+        # Накопленное покрытие сглаженных линий в линейном пространстве
+        self.coverage = np.zeros((height, width), dtype=np.float32)
+        self.lut = gamma_lut()
+        # Окно отсечения (xmin, ymin, xmax, ymax) для растеризаторов
+        self.viewport = (0, 0, width - 1, height - 1)
+        self.canvas = None
+        self.photo = None
+
+    def attach(self, canvas):
+        """Создаёт на холсте единственный элемент-изображение для буфера"""
+        self.canvas = canvas
+        self.photo = tk.PhotoImage(width=self.width, height=self.height)
+        canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
+        self.present()
+
+    def clear(self):
+        self.pixels.fill(self.background)
+        self.coverage.fill(0)
+
+    def inside(self, xs, ys):
+        """Маска пикселей, попадающих в буфер"""
+        return (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+
+    def plot(self, xs, ys, intensity=1.0):
+        """Записывает пиксели; интенсивность 1 - чёрный, 0 - белый"""
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        gray = ((1 - np.clip(intensity, 0, 1)) * 255).astype(np.uint8)
+        gray = np.broadcast_to(gray, xs.shape)
+        mask = self.inside(xs, ys)
+        self.pixels[ys[mask], xs[mask]] = gray[mask]
+
+    def accumulate(self, xs, ys, coverage):
+        """Складывает покрытие в буфер накопления и переводит в цвет только изменённые пиксели.
+
+        Остальные пиксели не трогаются: иначе линия, нарисованная поверх через
+        plot, снова затемнялась бы старым покрытием.
+        """
+        mask = self.inside(xs, ys)
+        xs, ys = xs[mask], ys[mask]
+        if not len(xs):
+            return
+        np.add.at(self.coverage, (ys, xs), np.asarray(coverage, dtype=np.float32)[mask])
+        index = (np.minimum(self.coverage[ys, xs], 1) * 255 + 0.5).astype(np.uint8)
+        self.pixels[ys, xs] = np.minimum(self.pixels[ys, xs], self.lut[index])
+
+    def resolve(self, x0=0, y0=0, x1=None, y1=None):
+        """Переводит покрытие прямоугольной области в цвета через гамма-таблицу"""
+        area = (slice(y0, y1), slice(x0, x1))
+        index = (np.minimum(self.coverage[area], 1) * 255 + 0.5).astype(np.uint8)
+        np.minimum(self.pixels[area], self.lut[index], out=self.pixels[area])
+
+    def fill_runs(self, xs, ys, lengths, horizontal, intensity=1.0):
+        """Заполняет серии пикселей, каждую одним присваиванием среза"""
+        gray = int((1 - min(max(intensity, 0), 1)) * 255)
+        for x, y, n, h in zip(xs.tolist(), ys.tolist(), lengths.tolist(), horizontal.tolist()):
+            if h:
+                if 0 <= y < self.height:
+                    self.pixels[y, max(x, 0):max(x + n, 0)] = gray
+            elif 0 <= x < self.width:
+                self.pixels[max(y, 0):max(y + n, 0), x] = gray
+
+    def to_ppm(self):
+        """Кодирует буфер в бинарный PGM (P5), понятный PhotoImage"""
+        header = f"P5 {self.width} {self.height} 255 ".encode()
+        return header + self.pixels.tobytes()
+
+    def present(self):
+        """Обновляет изображение на холсте содержимым буфера"""
+        if self.photo is not None:
+            self.photo.configure(data=self.to_ppm(), format="PPM")
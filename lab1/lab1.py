@@ -1,106 +1,102 @@
 import tkinter as tk
 import time
 
+import numpy as np
 
-def dda_line(x1, y1, x2, y2, canvas, delay=0.05):
-    if x1 == x2 and y1 == y2:  # Проверка на одинаковые точки
-        canvas.create_oval(x1, y1, x1 + 1, y1 + 1, fill="black")
-        return
-
-    dx = x2 - x1
-    dy = y2 - y1
-    steps = max(abs(dx), abs(dy))
-    x_inc = dx / float(steps)
-    y_inc = dy / float(steps)
+from framebuffer import FrameBuffer
+from rasterizer import dda_batch, bresenham_batch, bresenham_runs, expand, wu_batch
+from tracing import ALGORITHMS, OFF, FULL, LEVEL_NAMES, TraceRecorder
 
-    x, y = x1, y1
-    for _ in range(int(steps) + 1):
-        print(f"DDA Point: ({x:.2f}, {y:.2f})")
-        canvas.create_oval(x, y, x + 1, y + 1, fill="black")
-        x += x_inc
-        y += y_inc
-        canvas.update()
-        if delay > 0:
-            time.sleep(delay)
+# Трассировка растеризаторов; по умолчанию выключена и ничего не стоит
+tracer = TraceRecorder()
 
+# Сколько записей трассировки проигрывается за один тик root.after
+REPLAY_BATCH = 4096
 
-# Алгоритм Брезенхама
-def bresenham_line(x1, y1, x2, y2, canvas, delay=0.05):
-    if x1 == x2 and y1 == y2:  # Проверка на одинаковые точки
-        canvas.create_oval(x1, y1, x1 + 1, y1 + 1, fill="black")
-        return
 
-    dx = abs(x2 - x1)
-    dy = abs(y2 - y1)
-    sx = 1 if x1 < x2 else -1
-    sy = 1 if y1 < y2 else -1
-    err = dx - dy
-
-    while True:
-        normalized_err = min(max(err / max(dx, dy), -1), 1)
-        print(f"Bresenham Point: ({x1}, {y1}), Error: {normalized_err:.2f}")
-        canvas.create_oval(x1, y1, x1 + 1, y1 + 1, fill="black")
-        if x1 == x2 and y1 == y2:
-            break
-        e2 = err * 2
-        if e2 > -dy:
-            err -= dy
-            x1 += sx
-        if e2 < dx:
-            err += dx
-            y1 += sy
-        canvas.update()
-        if delay > 0:
-            time.sleep(delay)
-
-
-# Алгоритм Ву
-def wu_line(x1, y1, x2, y2, canvas, delay=0.05):
-    if x1 == x2 and y1 == y2:  # Проверка на одинаковые точки
-        canvas.create_oval(x1, y1, x1 + 1, y1 + 1, fill="black")
+def plot_pixels(framebuffer, xs, ys, intensity, delay, label):
+    tracer.record(label, xs, ys, intensity)
+    intensity = np.broadcast_to(intensity, xs.shape)
+    if delay <= 0:
+        framebuffer.plot(xs, ys, intensity)
+        framebuffer.present()
         return
+    # В режиме отладки показываем каждый пиксель отдельно
+    for n in range(len(xs)):
+        framebuffer.plot(xs[n:n + 1], ys[n:n + 1], intensity[n:n + 1])
+        framebuffer.present()
+        framebuffer.canvas.update()
+        time.sleep(delay)
 
-    def plot(x, y, intensity):
-        color = get_color(intensity)
-        canvas.create_oval(x, y, x + 1, y + 1, fill=color)
 
-    dx = x2 - x1
-    dy = y2 - y1
-    steep = abs(dy) > abs(dx)
+def dda_line(x1, y1, x2, y2, framebuffer, delay=0.05):
+    xs, ys, _ = dda_batch([x1, y1, x2, y2], framebuffer.viewport)
+    plot_pixels(framebuffer, xs, ys, 1.0, delay, "DDA")
 
-    if steep:
-        x1, y1 = y1, x1
-        x2, y2 = y2, x2
 
-    if x1 > x2:
-        x1, x2 = x2, x1
-        y1, y2 = y2, y1
-
-    dx = x2 - x1
-    dy = y2 - y1
-    gradient = dy / dx if dx != 0 else 0
+# Алгоритм Брезенхама
+def bresenham_line(x1, y1, x2, y2, framebuffer, delay=0.05):
+    xs, ys, _ = bresenham_batch([x1, y1, x2, y2], framebuffer.viewport)
+    plot_pixels(framebuffer, xs, ys, 1.0, delay, "Bresenham")
+
+
+# Алгоритм Брезенхама по сериям пикселей
+def bresenham_runs_line(x1, y1, x2, y2, framebuffer, delay=0.05):
+    xs, ys, lengths, horizontal, _ = bresenham_runs([x1, y1, x2, y2], framebuffer.viewport)
+    tracer.record("Bresenham Runs", xs, ys, 1.0, lengths, horizontal)
+    if delay <= 0:
+        framebuffer.fill_runs(xs, ys, lengths, horizontal)
+        framebuffer.present()
+        return
+    for n in range(len(xs)):
+        framebuffer.fill_runs(xs[n:n + 1], ys[n:n + 1], lengths[n:n + 1], horizontal[n:n + 1])
+        framebuffer.present()
+        framebuffer.canvas.update()
+        time.sleep(delay)
 
-    y = y1
 
-    for x in range(int(x1), int(x2) + 1):
-        intensity = y - int(y)
-        print(f"Wu Point: ({int(x)}, {int(y)}), Intensity: {intensity:.2f}")
-        if steep:
-            plot(int(y), x, intensity)
-            plot(int(y) + 1, x, 1 - intensity)
+# Алгоритм Ву
+def wu_line(x1, y1, x2, y2, framebuffer, delay=0.05, accumulate=False):
+    xs, ys, coverage, _ = wu_batch([x1, y1, x2, y2], framebuffer.viewport)
+    if not accumulate:
+        plot_pixels(framebuffer, xs, ys, coverage, delay, "Wu")
+        return
+    # Покрытие складывается с уже нарисованными линиями, а не затирает их
+    tracer.record("Wu Blend", xs, ys, coverage)
+    if delay <= 0:
+        framebuffer.accumulate(xs, ys, coverage)
+        framebuffer.present()
+        return
+    for n in range(len(xs)):
+        framebuffer.accumulate(xs[n:n + 1], ys[n:n + 1], coverage[n:n + 1])
+        framebuffer.present()
+        framebuffer.canvas.update()
+        time.sleep(delay)
+
+
+def replay_trace(records, framebuffer):
+    """Рисует пачку записей трассировки.
+
+    Серии раскладываются на пиксели в порядке записей, так что при
+    наложении, как и при пошаговом проигрывании, побеждает более поздняя.
+    Подряд идущие записи одного вида идут одним вызовом: обычные - через
+    plot, линии Ву с накоплением - через accumulate и гамма-таблицу.
+    """
+    blend = records["algorithm"] == ALGORITHMS.index("Wu Blend")
+    bounds = np.flatnonzero(np.diff(blend)) + 1
+    for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(records)]):
+        if lo == hi:
+            continue
+        group = records[lo:hi]
+        rec, step, _ = expand(group["length"])
+        horizontal = group["horizontal"][rec]
+        xs = group["x"][rec] + np.where(horizontal, step, 0)
+        ys = group["y"][rec] + np.where(horizontal, 0, step)
+        if blend[lo]:
+            framebuffer.accumulate(xs, ys, group["value"][rec])
         else:
-            plot(x, y, intensity)
-            plot(x, int(y) + 1, 1 - intensity)
-        y += gradient
-        canvas.update()
-        if delay > 0:
-            time.sleep(delay)
-
-
-def get_color(intensity):
-    intensity = max(0, min(intensity, 1))
-    gray_value = int((1 - intensity) * 255)
-    return f"#{gray_value:02x}{gray_value:02x}{gray_value:02x}"
+            framebuffer.plot(xs, ys, group["value"][rec])
+    framebuffer.present()
 
 
 # Главное окно приложения
@@ -112,19 +108,45 @@ class LineDrawingApp:
         self.canvas = tk.Canvas(self.root, bg='white', width=800, height=600)
         self.canvas.pack()
 
+        # Все линии рисуются в один буфер, показываемый одним изображением
+        self.framebuffer = FrameBuffer(800, 600)
+        self.framebuffer.attach(self.canvas)
+
         self.button_dda = tk.Button(self.root, text="DDA", command=self.dda)
         self.button_dda.pack(side="left")
 
         self.button_bresenham = tk.Button(self.root, text="Bresenham", command=self.bresenham)
         self.button_bresenham.pack(side="left")
 
+        self.button_runs = tk.Button(self.root, text="Bresenham Runs", command=self.bresenham_runs)
+        self.button_runs.pack(side="left")
+
         self.button_wu = tk.Button(self.root, text="Wu", command=self.wu)
         self.button_wu.pack(side="left")
 
+        self.blend_button = tk.Button(self.root, text="Wu Blend: on", command=self.toggle_blend)
+        self.blend_button.pack(side="left")
+
         self.debug_button = tk.Button(self.root, text="Debug Mode", command=self.toggle_debug)
         self.debug_button.pack(side="left")
 
+        self.trace_button = tk.Button(self.root, text="Trace: off", command=self.cycle_trace)
+        self.trace_button.pack(side="left")
+
+        self.replay_button = tk.Button(self.root, text="Replay Trace", command=self.replay)
+        self.replay_button.pack(side="left")
+
+        self.save_trace_button = tk.Button(self.root, text="Save Trace", command=self.save_trace)
+        self.save_trace_button.pack(side="left")
+
         self.is_debug_mode = False
+        self.is_blend_mode = True
+
+        # Проигрывание трассировки идёт пачками через root.after и не
+        # блокирует окно; повторное нажатие кнопки его останавливает
+        self.replay_job = None
+        self.replay_records = None
+        self.replay_position = 0
         self.selected_algorithm = "DDA"
 
         self.start_x, self.start_y, self.end_x, self.end_y = None, None, None, None
@@ -134,6 +156,49 @@ class LineDrawingApp:
     def toggle_debug(self):
         self.is_debug_mode = not self.is_debug_mode
 
+    def toggle_blend(self):
+        self.is_blend_mode = not self.is_blend_mode
+        self.blend_button.config(text=f"Wu Blend: {'on' if self.is_blend_mode else 'off'}")
+
+    def cycle_trace(self):
+        tracer.level = (tracer.level + 1) % (FULL + 1)
+        self.trace_button.config(text=f"Trace: {LEVEL_NAMES[tracer.level]}")
+
+    def replay(self):
+        """Проигрывает полную трассировку на чистом буфере или останавливает проигрывание"""
+        if self.replay_job is not None:
+            self.stop_replay()
+            return
+        self.framebuffer.clear()
+        self.framebuffer.present()
+        self.replay_records = tracer.records()
+        self.replay_position = 0
+        self.replay_button.config(text="Stop Replay")
+        self.replay_tick()
+
+    def replay_tick(self):
+        """Одна пачка записей; в режиме отладки - по одной записи за тик"""
+        batch = 1 if self.is_debug_mode else REPLAY_BATCH
+        start = self.replay_position
+        self.replay_position = min(start + batch, len(self.replay_records))
+        replay_trace(self.replay_records[start:self.replay_position], self.framebuffer)
+        if self.replay_position < len(self.replay_records):
+            self.replay_job = self.root.after(200 if self.is_debug_mode else 1, self.replay_tick)
+        else:
+            self.replay_job = None
+            self.stop_replay()
+
+    def stop_replay(self):
+        if self.replay_job is not None:
+            self.root.after_cancel(self.replay_job)
+            self.replay_job = None
+        self.replay_records = None
+        self.replay_button.config(text="Replay Trace")
+
+    def save_trace(self):
+        tracer.save_csv("trace.csv")
+        tracer.save_numpy("trace.npy")
+
     def on_click(self, event):
         if self.start_x is None and self.start_y is None:
             self.start_x, self.start_y = event.x, event.y
@@ -145,11 +210,16 @@ class LineDrawingApp:
     def draw_line(self):
         delay = 0.2 if self.is_debug_mode else 0
         if self.selected_algorithm == "DDA":
-            dda_line(self.start_x, self.start_y, self.end_x, self.end_y, self.canvas, delay)
+            dda_line(self.start_x, self.start_y, self.end_x, self.end_y, self.framebuffer, delay)
         elif self.selected_algorithm == "Bresenham":
-            bresenham_line(self.start_x, self.start_y, self.end_x, self.end_y, self.canvas, delay)
+            bresenham_line(self.start_x, self.start_y, self.end_x, self.end_y, self.framebuffer, delay)
+        elif self.selected_algorithm == "Bresenham Runs":
+            bresenham_runs_line(self.start_x, self.start_y, self.end_x, self.end_y, self.framebuffer, delay)
         elif self.selected_algorithm == "Wu":
-            wu_line(self.start_x, self.start_y, self.end_x, self.end_y, self.canvas, delay)
+            wu_line(self.start_x, self.start_y, self.end_x, self.end_y, self.framebuffer, delay,
+                    self.is_blend_mode)
+        if tracer.level != OFF:
+            print(tracer.summary())
 
     def dda(self):
         self.selected_algorithm = "DDA"
@@ -157,6 +227,9 @@ class LineDrawingApp:
     def bresenham(self):
         self.selected_algorithm = "Bresenham"
 
+    def bresenham_runs(self):
+        self.selected_algorithm = "Bresenham Runs"
+
     def wu(self):
         self.selected_algorithm = "Wu"
 
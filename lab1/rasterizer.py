@@ -0,0 +1,209 @@
+import numpy as np
+
+from clipping import inside, visible_steps
+
+
+def as_segments(segments):
+    """Приводит набор отрезков к массиву (N, 4): x1, y1, x2, y2"""
+    return np.asarray(segments, dtype=float).reshape(-1, 4)
+
+
+def expand(lengths):
+    """Номер отрезка и номер шага для каждого пикселя упакованного массива"""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    seg = np.repeat(np.arange(len(lengths)), lengths)
+    step = np.arange(offsets[-1], dtype=np.int64) - offsets[seg]
+    return seg, step, offsets
+
+
+def step_range(segments, origin, span, count, viewport):
+    """Номер отрезка и номер шага для каждого шага, оставшегося после отсечения"""
+    if viewport is None:
+        k, i, _ = expand(count)
+        return k, i
+    first, last = visible_steps(segments, origin, span, count, viewport)
+    k, i, _ = expand(last - first + 1)
+    return k, first[k] + i
+
+
+def pack(k, n, mask=None):
+    """Смещения отрезков в упакованном массиве пикселей"""
+    if mask is not None:
+        k = k[mask]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(k, minlength=n), out=offsets[1:])
+    return offsets
+
+
+def dda_batch(segments, viewport=None):
+    """Алгоритм ЦДА для всех отрезков сразу.
+
+    Возвращает (xs, ys, offsets): пиксели отрезка k лежат в
+    xs[offsets[k]:offsets[k + 1]]. Если задано окно viewport =
+    (xmin, ymin, xmax, ymax), отрезки предварительно отсекаются по нему.
+    """
+    seg = as_segments(segments)
+    x1, y1, x2, y2 = seg.T
+    dx = x2 - x1
+    dy = y2 - y1
+    steps = np.maximum(np.abs(dx), np.abs(dy)).astype(np.int64)
+    safe = np.maximum(steps, 1)
+
+    k, i = step_range(seg, 0, steps, steps + 1, viewport)
+    xs = np.floor(x1[k] + i * dx[k] / safe[k] + 0.5).astype(np.int64)
+    ys = np.floor(y1[k] + i * dy[k] / safe[k] + 0.5).astype(np.int64)
+    if viewport is None:
+        return xs, ys, pack(k, len(seg))
+    mask = inside(xs, ys, viewport)
+    return xs[mask], ys[mask], pack(k, len(seg), mask)
+
+
+def bresenham_setup(segments):
+    """Общие величины для пошагового и серийного алгоритмов Брезенхама"""
+    seg = np.rint(as_segments(segments)).astype(np.int64)
+    x1, y1, x2, y2 = seg.T
+    dx = np.abs(x2 - x1)
+    dy = np.abs(y2 - y1)
+    sx = np.where(x1 < x2, 1, -1)
+    sy = np.where(y1 < y2, 1, -1)
+    x_major = dx >= dy
+    major = np.where(x_major, dx, dy)
+    minor = np.where(x_major, dy, dx)
+    return seg, x1, y1, sx, sy, x_major, major, minor
+
+
+def bresenham_offset(i, major, minor):
+    """Смещение по неосновной оси на шаге i"""
+    return (2 * i * minor + np.maximum(major - 1, 0)) // (2 * np.maximum(major, 1))
+
+
+def bresenham_batch(segments, viewport=None):
+    """Алгоритм Брезенхама для всех отрезков сразу.
+
+    Смещение по неосновной оси вычисляется в замкнутой форме
+    (2 * i * d_minor + d_major - 1) // (2 * d_major), что даёт ровно те же
+    пиксели, что и пошаговый цикл с ошибкой err = dx - dy.
+    """
+    seg, x1, y1, sx, sy, x_major, major, minor = bresenham_setup(segments)
+
+    k, i = step_range(seg, 0, major, major + 1, viewport)
+    j = bresenham_offset(i, major[k], minor[k])
+    xm = x_major[k]
+    xs = x1[k] + sx[k] * np.where(xm, i, j)
+    ys = y1[k] + sy[k] * np.where(xm, j, i)
+    if viewport is None:
+        return xs, ys, pack(k, len(seg))
+    mask = inside(xs, ys, viewport)
+    return xs[mask], ys[mask], pack(k, len(seg), mask)
+
+
+def bresenham_runs(segments, viewport=None):
+    """Брезенхам по сериям: целые горизонтальные/вертикальные отрезки пикселей.
+
+    Серия k (постоянная координата по неосновной оси) начинается на шаге
+    i_k = ceil((2 * k * d_major - c) / (2 * d_minor)), c = d_major - 1, то есть
+    в той же точке, где пошаговый алгоритм впервые сдвигается на k.
+    Возвращает (xs, ys, lengths, horizontal, offsets): (xs, ys) - пиксель
+    серии с наименьшей координатой по основной оси, lengths - её длина.
+    При отсечении серии обрезаются до шагов, видимых в окне.
+    """
+    seg, x1, y1, sx, sy, x_major, major, minor = bresenham_setup(segments)
+    if viewport is None:
+        first, last = np.zeros_like(major), major
+    else:
+        first, last = visible_steps(seg, 0, major, major + 1, viewport)
+    lo = bresenham_offset(first, major, minor)
+    hi = np.where(last >= first, bresenham_offset(np.maximum(last, 0), major, minor), lo - 1)
+
+    k, run, _ = expand(hi - lo + 1)
+    run += lo[k]
+    M = major[k]
+    m = np.maximum(minor[k], 1)
+    c = np.maximum(M - 1, 0)
+
+    def run_start(r):
+        # -((-a) // b) - целочисленный ceil(a / b)
+        start = -((c - 2 * r * M) // (2 * m))
+        return np.clip(start, 0, M + 1)
+
+    start = np.maximum(run_start(run), first[k])
+    stop = np.minimum(np.where(run == minor[k], M + 1, run_start(run + 1)), last[k] + 1)
+    lengths = stop - start
+
+    xm = x_major[k]
+    s_major = np.where(xm, sx[k], sy[k])
+    s_minor = np.where(xm, sy[k], sx[k])
+    o_major = np.where(xm, x1[k], y1[k])
+    o_minor = np.where(xm, y1[k], x1[k])
+    low = np.where(s_major > 0, o_major + start, o_major - stop + 1)
+    level = o_minor + s_minor * run
+    xs = np.where(xm, low, level)
+    ys = np.where(xm, level, low)
+    return xs, ys, lengths, xm, pack(k, len(seg))
+
+
+def wu_batch(segments, viewport=None):
+    """Алгоритм Ву для всех отрезков сразу.
+
+    На каждый шаг по основной оси приходится два пикселя: (xs[2n], ys[2n])
+    и (xs[2n + 1], ys[2n + 1]) с покрытием coverage в диапазоне [0, 1].
+    Возвращает (xs, ys, coverage, offsets). При отсечении пиксели пары,
+    попавшие за пределы окна, отбрасываются по отдельности.
+    """
+    seg = as_segments(segments)
+    x1, y1, x2, y2 = seg.T.copy()
+    steep = np.abs(y2 - y1) > np.abs(x2 - x1)
+    x1, y1 = np.where(steep, y1, x1), np.where(steep, x1, y1)
+    x2, y2 = np.where(steep, y2, x2), np.where(steep, x2, y2)
+    swap = x1 > x2
+    x1, x2 = np.where(swap, x2, x1), np.where(swap, x1, x2)
+    y1, y2 = np.where(swap, y2, y1), np.where(swap, y1, y2)
+
+    dx = x2 - x1
+    gradient = np.divide(y2 - y1, dx, out=np.zeros_like(dx), where=dx != 0)
+    start = np.trunc(x1).astype(np.int64)
+    columns = np.trunc(x2).astype(np.int64) - start + 1
+
+    if viewport is None:
+        k, i, _ = expand(columns)
+    else:
+        # Отсекаем в системе координат после перестановки осей. Последний
+        # столбец может лежать за концом отрезка, поэтому отрезок удлиняется
+        # на шаг в обе стороны: шаг i соответствует t * (dx + 2) - 1.
+        xmin, ymin, xmax, ymax = viewport
+        extended = np.stack([x1 - 1, y1 - gradient, x2 + 1, y2 + gradient], axis=1)
+        ks, steps = [], []
+        for idx, view in ((np.flatnonzero(~steep), viewport),
+                          (np.flatnonzero(steep), (ymin, xmin, ymax, xmax))):
+            kk, ii = step_range(extended[idx], 1, dx[idx] + 2, columns[idx], view)
+            ks.append(idx[kk])
+            steps.append(ii)
+        k = np.concatenate(ks)
+        i = np.concatenate(steps)
+        order = np.argsort(k, kind="stable")
+        k, i = k[order], i[order]
+
+    major = start[k] + i
+    y = y1[k] + i * gradient[k]
+    base = np.floor(y)
+    frac = y - base
+    base = base.astype(np.int64)
+
+    # Два пикселя на столбец: ближний получает 1 - frac, дальний - frac
+    major = np.repeat(major, 2)
+    minor = np.repeat(base, 2)
+    minor[1::2] += 1
+    coverage = np.empty(2 * len(frac))
+    coverage[0::2] = 1 - frac
+    coverage[1::2] = frac
+
+    st = np.repeat(steep[k], 2)
+    xs = np.where(st, minor, major)
+    ys = np.where(st, major, minor)
+    k = np.repeat(k, 2)
+    if viewport is None:
+        return xs, ys, coverage, pack(k, len(seg))
+    mask = inside(xs, ys, viewport)
+    return xs[mask], ys[mask], coverage[mask], pack(k, len(seg), mask)
@@ -0,0 +1,182 @@
+"""Растеризация очень больших наборов отрезков по тайлам в пуле процессов.
+
+Отрезки раскладываются по квадратным тайлам экрана, каждый тайл
+растеризуется отдельным процессом с отсечением по его границам и пишется
+прямо в общий (shared memory) буфер кадра. Тайлы не пересекаются, поэтому
+процессы не мешают друг другу, а результат совпадает с последовательным.
+
+Запуск как скрипта выполняет замер масштабирования на 1..N ядрах:
+    python tiled.py --segments 1000000 --size 8192
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from rasterizer import as_segments, bresenham_batch, dda_batch, wu_batch
+
+RASTERIZERS = {"dda": dda_batch, "bresenham": bresenham_batch, "wu": wu_batch}
+
+# Сколько отрезков растеризуется за один вызов, чтобы ограничить память
+CHUNK = 1 << 16
+
+
+def new_target(algorithm, width, height, buffer=None):
+    """Буфер результата: яркость uint8 для ЦДА/Брезенхама, покрытие float32 для Ву"""
+    if algorithm == "wu":
+        return np.ndarray((height, width), dtype=np.float32, buffer=buffer)
+    return np.ndarray((height, width), dtype=np.uint8, buffer=buffer)
+
+
+def draw_chunk(target, algorithm, segments, viewport):
+    """Растеризует отрезки с отсечением по viewport и пишет их в буфер"""
+    if algorithm == "wu":
+        xs, ys, coverage, _ = wu_batch(segments, viewport)
+        np.add.at(target, (ys, xs), coverage.astype(np.float32))
+    else:
+        xs, ys, _ = RASTERIZERS[algorithm](segments, viewport)
+        target[ys, xs] = 0
+
+
+def render_serial(segments, width, height, algorithm="bresenham"):
+    """Эталонная однопоточная растеризация всего набора"""
+    segments = as_segments(segments)
+    target = new_target(algorithm, width, height)
+    target.fill(0 if algorithm == "wu" else 255)
+    viewport = (0, 0, width - 1, height - 1)
+    for start in range(0, len(segments), CHUNK):
+        draw_chunk(target, algorithm, segments[start:start + CHUNK], viewport)
+    return target
+
+
+def bin_segments(segments, width, height, tile):
+    """Раскладывает отрезки по тайлам.
+
+    Возвращает номера отрезков, упорядоченные по тайлам (внутри тайла - в
+    исходном порядке), и смещения начала каждого тайла в этом массиве.
+    Ограничивающий прямоугольник расширяется на два пикселя: Ву продолжает
+    отрезок до целого столбца и закрашивает соседний пиксель.
+    """
+    x1, y1, x2, y2 = segments.T
+    cols = (width + tile - 1) // tile
+    rows = (height + tile - 1) // tile
+    tx0 = np.clip(np.floor((np.minimum(x1, x2) - 2) / tile), 0, cols - 1).astype(np.int64)
+    tx1 = np.clip(np.floor((np.maximum(x1, x2) + 2) / tile), 0, cols - 1).astype(np.int64)
+    ty0 = np.clip(np.floor((np.minimum(y1, y2) - 2) / tile), 0, rows - 1).astype(np.int64)
+    ty1 = np.clip(np.floor((np.maximum(y1, y2) + 2) / tile), 0, rows - 1).astype(np.int64)
+
+    # Отрезки целиком за пределами растра ни в один тайл не попадают
+    visible = ((np.maximum(x1, x2) >= -2) & (np.minimum(x1, x2) <= width + 1)
+               & (np.maximum(y1, y2) >= -2) & (np.minimum(y1, y2) <= height + 1))
+    nx = np.where(visible, tx1 - tx0 + 1, 0)
+    ny = np.where(visible, ty1 - ty0 + 1, 0)
+
+    counts = nx * ny
+    seg = np.repeat(np.arange(len(segments)), counts)
+    local = np.arange(len(seg)) - np.repeat(np.cumsum(counts) - counts, counts)
+    tiles = (ty0[seg] + local // nx[seg]) * cols + tx0[seg] + local % nx[seg]
+
+    order = np.argsort(tiles, kind="stable")
+    offsets = np.zeros(cols * rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tiles, minlength=cols * rows), out=offsets[1:])
+    return seg[order], offsets, cols
+
+
+# Общие массивы, к которым подключается каждый рабочий процесс
+_shared = {}
+
+
+def _attach(algorithm, width, height, n_segments, n_order, names):
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _shared["blocks"] = blocks
+    _shared["algorithm"] = algorithm
+    _shared["target"] = new_target(algorithm, width, height, blocks[0].buf)
+    _shared["segments"] = np.ndarray((n_segments, 4), dtype=np.float64, buffer=blocks[1].buf)
+    _shared["order"] = np.ndarray((n_order,), dtype=np.int64, buffer=blocks[2].buf)
+
+
+def _render_tile(task):
+    viewport, start, stop = task
+    index = _shared["order"][start:stop]
+    for chunk in range(0, len(index), CHUNK):
+        segments = _shared["segments"][index[chunk:chunk + CHUNK]]
+        draw_chunk(_shared["target"], _shared["algorithm"], segments, viewport)
+    return stop - start
+
+
+def render_tiled(segments, width, height, algorithm="bresenham", tile=512, workers=None):
+    """Растеризация по тайлам в пуле процессов; результат равен render_serial"""
+    segments = as_segments(segments)
+    order, offsets, cols = bin_segments(segments, width, height, tile)
+
+    target_bytes = new_target(algorithm, 0, 0).itemsize * width * height
+    blocks = [shared_memory.SharedMemory(create=True, size=max(size, 1))
+              for size in (target_bytes, segments.nbytes, order.nbytes)]
+    try:
+        target = new_target(algorithm, width, height, blocks[0].buf)
+        target.fill(0 if algorithm == "wu" else 255)
+        np.ndarray(segments.shape, dtype=np.float64, buffer=blocks[1].buf)[:] = segments
+        np.ndarray(order.shape, dtype=np.int64, buffer=blocks[2].buf)[:] = order
+
+        tasks = []
+        for t in range(len(offsets) - 1):
+            if offsets[t] == offsets[t + 1]:
+                continue
+            x0 = (t % cols) * tile
+            y0 = (t // cols) * tile
+            viewport = (x0, y0, min(x0 + tile, width) - 1, min(y0 + tile, height) - 1)
+            tasks.append((viewport, int(offsets[t]), int(offsets[t + 1])))
+
+        args = (algorithm, width, height, len(segments), len(order), [b.name for b in blocks])
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=args) as pool:
+            # Сначала самые загруженные тайлы, чтобы пул не простаивал в конце
+            tasks.sort(key=lambda task: task[1] - task[2])
+            for _ in pool.map(_render_tile, tasks):
+                pass
+        result = target.copy()
+        del target
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return result
+
+
+def random_segments(n, width, height, max_length=200, seed=0):
+    """Случайные отрезки для замеров"""
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(0, [width, height], size=(n, 2))
+    end = start + rng.uniform(-max_length, max_length, size=(n, 2))
+    return np.hstack([start, end])
+
+
+def benchmark_scaling(n_segments, size, algorithm="bresenham", tile=512, max_workers=None):
+    """Время растеризации при 1..N процессах и сверка с последовательным результатом"""
+    max_workers = max_workers or os.cpu_count()
+    segments = random_segments(n_segments, size, size)
+
+    start = time.perf_counter()
+    reference = render_serial(segments, size, size, algorithm)
+    serial = time.perf_counter() - start
+    print(f"serial: {serial:.2f} s")
+
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        result = render_tiled(segments, size, size, algorithm, tile, workers)
+        elapsed = time.perf_counter() - start
+        same = np.array_equal(result, reference)
+        print(f"{workers} workers: {elapsed:.2f} s, speedup {serial / elapsed:.2f}x, identical: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Масштабирование тайловой растеризации")
+    parser.add_argument("--segments", type=int, default=1_000_000)
+    parser.add_argument("--size", type=int, default=8192)
+    parser.add_argument("--algorithm", choices=sorted(RASTERIZERS), default="bresenham")
+    parser.add_argument("--tile", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    benchmark_scaling(args.segments, args.size, args.algorithm, args.tile, args.workers)
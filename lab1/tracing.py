@@ -0,0 +1,89 @@
+import numpy as np
+
+# Уровни трассировки
+OFF, SUMMARY, FULL = 0, 1, 2
+LEVEL_NAMES = {OFF: "off", SUMMARY: "summary", FULL: "full"}
+
+# "Wu Blend" - Ву с накоплением покрытия: при проигрывании такие пиксели
+# складываются через accumulate, а не записываются поверх
+ALGORITHMS = ("DDA", "Bresenham", "Bresenham Runs", "Wu", "Wu Blend")
+
+# Одна запись - пиксель или серия пикселей длины length
+TRACE_DTYPE = np.dtype([
+    ("algorithm", np.uint8),
+    ("x", np.int32),
+    ("y", np.int32),
+    ("length", np.int32),
+    ("horizontal", np.bool_),
+    ("value", np.float64),  # Как при рисовании: во float32 серый сбивается на единицу
+])
+
+
+class TraceRecorder:
+    """Запись трассировки растеризаторов в заранее выделенный кольцевой буфер.
+
+    OFF - ничего не пишется, SUMMARY - только счётчики пикселей по алгоритмам,
+    FULL - каждый пиксель (или серия) попадает в буфер; при переполнении
+    старые записи затираются новыми.
+    """
+
+    def __init__(self, capacity=1 << 16, level=OFF):
+        self.level = level
+        self.buffer = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.head = 0
+        self.total = 0
+        self.pixel_counts = dict.fromkeys(ALGORITHMS, 0)
+        self.line_counts = dict.fromkeys(ALGORITHMS, 0)
+
+    @property
+    def capacity(self):
+        return len(self.buffer)
+
+    def clear(self):
+        self.head = 0
+        self.total = 0
+        self.pixel_counts = dict.fromkeys(ALGORITHMS, 0)
+        self.line_counts = dict.fromkeys(ALGORITHMS, 0)
+
+    def record(self, algorithm, xs, ys, value=1.0, lengths=1, horizontal=True):
+        """Записывает пиксели (или серии) одной линии"""
+        if self.level == OFF:
+            return
+        lengths = np.broadcast_to(lengths, xs.shape)
+        self.line_counts[algorithm] += 1
+        self.pixel_counts[algorithm] += int(lengths.sum())
+        if self.level < FULL:
+            return
+
+        # В буфер попадают только последние capacity записей
+        n = min(len(xs), self.capacity)
+        idx = (self.head + np.arange(n)) % self.capacity
+        rec = self.buffer
+        rec["algorithm"][idx] = ALGORITHMS.index(algorithm)
+        rec["x"][idx] = xs[-n:]
+        rec["y"][idx] = ys[-n:]
+        rec["length"][idx] = lengths[-n:]
+        rec["horizontal"][idx] = np.broadcast_to(horizontal, xs.shape)[-n:]
+        rec["value"][idx] = np.broadcast_to(value, xs.shape)[-n:]
+        self.head = (self.head + n) % self.capacity
+        self.total += len(xs)
+
+    def records(self):
+        """Записи буфера в хронологическом порядке"""
+        if self.total < self.capacity:
+            return self.buffer[:self.total].copy()
+        return np.roll(self.buffer, -self.head)
+
+    def summary(self):
+        return ", ".join(f"{name}: {self.line_counts[name]} lines / {self.pixel_counts[name]} px"
+                         for name in ALGORITHMS if self.line_counts[name])
+
+    def save_numpy(self, path):
+        np.save(path, self.records())
+
+    def save_csv(self, path):
+        records = self.records()
+        with open(path, "w") as f:
+            f.write("algorithm,x,y,length,horizontal,value\n")
+            for a, x, y, n, h, v in records.tolist():
+                f.write(f"{ALGORITHMS[a]},{x},{y},{n},{int(h)},{v:.4f}\n")
@@ -0,0 +1,124 @@
+"""Сравнение целочисленного движка конических сечений с прежним вещественным.
+
+    python benchmark.py --sizes 1000 100000 1000000
+
+Для каждого размера выводятся точки в секунду обеих реализаций,
+наибольшее отклонение точек от истинной кривой в пикселях и число точек,
+в которых реализации разошлись.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from conics import QUADRANTS, ellipse_pattern, hyperbola_pattern, symmetric_pattern
+
+
+def float_ellipse_pattern(a, b):
+    """Прежний эллипс: решающая переменная в числах с плавающей точкой"""
+    steps = []
+    x, y = 0, b
+    d1 = b**2 - a**2 * b + 0.25 * a**2
+
+    while (a**2) * (y - 0.5) > (b**2) * (x + 1):
+        steps.append((x, y))
+        x += 1
+        if d1 < 0:
+            d1 += (2 * b**2) * x + b**2
+        else:
+            y -= 1
+            d1 += (2 * b**2) * x - (2 * a**2) * y + b**2
+
+    d2 = b**2 * (x + 0.5) ** 2 + a**2 * (y - 1) ** 2 - a**2 * b**2
+    while y >= 0:
+        steps.append((x, y))
+        y -= 1
+        if d2 > 0:
+            d2 += a**2 - 2 * a**2 * y
+        else:
+            x += 1
+            d2 += (2 * b**2) * x - (2 * a**2) * y + a**2
+    return symmetric_pattern(steps, QUADRANTS)
+
+
+def float_hyperbola_pattern(a, b, xlim, ylim):
+    """Прежняя гипербола: решающая переменная в числах с плавающей точкой"""
+    steps = []
+    x, y = a, 0
+
+    d1 = b ** 2 * (x + 0.5) ** 2 - a ** 2 * (y + 1) ** 2 - a ** 2 * b ** 2
+    while (b ** 2) * (x - 0.5) > (a ** 2) * (y + 1):
+        if x > xlim or y > ylim:
+            return symmetric_pattern(steps, QUADRANTS)
+        steps.append((x, y))
+        y += 1
+        if d1 < 0:
+            d1 += (2 * a ** 2) * y + a ** 2
+        else:
+            x += 1
+            d1 += (2 * a ** 2) * y - (2 * b ** 2) * x + a ** 2
+
+    d2 = b ** 2 * (x + 1) ** 2 - a ** 2 * (y + 0.5) ** 2 - a ** 2 * b ** 2
+    while x <= xlim and y <= ylim:
+        steps.append((x, y))
+        x += 1
+        if d2 > 0:
+            d2 += b ** 2 - (2 * b ** 2) * x
+        else:
+            y += 1
+            d2 += (2 * a ** 2) * y - (2 * b ** 2) * x + b ** 2
+    return symmetric_pattern(steps, QUADRANTS)
+
+
+def ellipse_error(pattern, a, b):
+    """Наибольшее отклонение точек от эллипса по нормали, в пикселях"""
+    x, y = pattern[0].T.astype(float)
+    f = x ** 2 / a ** 2 + y ** 2 / b ** 2 - 1
+    grad = np.hypot(2 * x / a ** 2, 2 * y / b ** 2)
+    return float(np.max(np.abs(f) / grad))
+
+
+def hyperbola_error(pattern, a, b):
+    """Наибольшее отклонение точек от гиперболы по нормали, в пикселях"""
+    x, y = pattern[0].T.astype(float)
+    f = x ** 2 / a ** 2 - y ** 2 / b ** 2 - 1
+    grad = np.hypot(2 * x / a ** 2, 2 * y / b ** 2)
+    return float(np.max(np.abs(f) / grad))
+
+
+def mismatches(old, new):
+    """Сколько точек первой четверти различаются у двух реализаций"""
+    n = min(old.shape[1], new.shape[1])
+    diff = np.any(old[0, :n] != new[0, :n], axis=1)
+    return int(np.count_nonzero(diff)) + abs(old.shape[1] - new.shape[1])
+
+
+def measure(build):
+    start = time.perf_counter()
+    pattern = build()
+    elapsed = time.perf_counter() - start
+    return pattern, pattern.shape[1] / elapsed
+
+
+def run(sizes):
+    for size in sizes:
+        a, b = size, size // 2 + 1
+        cases = (
+            ("ellipse", lambda: float_ellipse_pattern(a, b), lambda: ellipse_pattern(a, b), ellipse_error),
+            ("hyperbola", lambda: float_hyperbola_pattern(b, a, 4 * size, 4 * size),
+             lambda: hyperbola_pattern(b, a, 4 * size, 4 * size), hyperbola_error),
+        )
+        for name, old, new, error in cases:
+            ab = (a, b) if name == "ellipse" else (b, a)
+            old_pattern, old_rate = measure(old)
+            new_pattern, new_rate = measure(new)
+            print(f"{name:<9} size={size:<8} "
+                  f"float: {old_rate / 1e6:6.2f} Mpt/s, err {error(old_pattern, *ab):10.3f} px | "
+                  f"int: {new_rate / 1e6:6.2f} Mpt/s, err {error(new_pattern, *ab):10.3f} px | "
+                  f"differ: {mismatches(old_pattern, new_pattern)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Целочисленный движок против вещественного")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    run(parser.parse_args().sizes)
@@ -0,0 +1,237 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+# Шаблон фигуры - массив смещений от центра формы (дуги, точки, 2): каждая
+# дуга - одна из симметричных копий, точки идут в порядке шагов алгоритма.
+
+
+def iter_circle(r):
+    """Алгоритм рисования окружности (Брезенхэм): шаги первого октанта"""
+    x, y, d = 0, r, 3 - 2 * r
+    while x <= y:
+        yield x, y
+        x += 1
+        if d > 0:
+            y -= 1
+            d += 4 * (x - y) + 10
+        else:
+            d += 4 * x + 6
+
+
+def iter_ellipse(a, b):
+    """Алгоритм рисования эллипса в целых числах: шаги первой четверти.
+
+    Решающие переменные умножены на 4, чтобы избавиться от 0.25 и 0.5;
+    приращения 8b^2 * x и 8a^2 * y ведутся накоплением, квадраты вычисляются
+    один раз. Точно для любых размеров: целые Python не переполняются.
+    """
+    aa, bb = a * a, b * b
+    aa4, bb4, aa8, bb8 = 4 * aa, 4 * bb, 8 * aa, 8 * bb
+    x, y = 0, b
+    sx, sy = 0, aa8 * y  # 8b^2 * x и 8a^2 * y
+    d1 = bb4 - aa4 * b + aa
+
+    while sy - aa4 > sx + bb8:
+        yield x, y
+        x += 1
+        sx += bb8
+        if d1 < 0:
+            d1 += sx + bb4
+        else:
+            y -= 1
+            sy -= aa8
+            d1 += sx - sy + bb4
+
+    d2 = bb * (2 * x + 1) ** 2 + aa4 * (y - 1) ** 2 - aa4 * bb
+    while y >= 0:
+        yield x, y
+        y -= 1
+        sy -= aa8
+        if d2 > 0:
+            d2 += aa4 - sy
+        else:
+            x += 1
+            sx += bb8
+            d2 += sx - sy + aa4
+
+
+def iter_hyperbola(a, b, xlim, ylim):
+    """Рисование гиперболы в целых числах до границы видимой области: шаги первой четверти.
+
+    Ветви монотонны, поэтому как только |x| > xlim или |y| > ylim, все
+    четыре симметричные точки уже за пределами окна и дальше не вернутся.
+    Решающие переменные умножены на 4, как в iter_ellipse.
+    """
+    aa, bb = a * a, b * b
+    aa4, bb4, aa8, bb8 = 4 * aa, 4 * bb, 8 * aa, 8 * bb
+    x, y = a, 0
+    sx, sy = bb8 * x, 0  # 8b^2 * x и 8a^2 * y
+
+    d1 = bb * (2 * x + 1) ** 2 - aa4 * (y + 1) ** 2 - aa4 * bb
+    while sx - bb4 > sy + aa8:
+        if x > xlim or y > ylim:
+            return
+        yield x, y
+        y += 1
+        sy += aa8
+        if d1 < 0:
+            d1 += sy + aa4
+        else:
+            x += 1
+            sx += bb8
+            d1 += sy - sx + aa4
+
+    d2 = bb4 * (x + 1) ** 2 - aa * (2 * y + 1) ** 2 - aa4 * bb
+    while x <= xlim and y <= ylim:
+        yield x, y
+        x += 1
+        sx += bb8
+        if d2 > 0:
+            d2 += bb4 - sx
+        else:
+            y += 1
+            sy += aa8
+            d2 += sy - sx + bb4
+
+
+# Порядок симметричных копий точки (x, y) - тот же, в котором их рисовали
+# исходные алгоритмы
+OCTANTS = ((1, 1, False), (1, 1, True), (-1, 1, True), (-1, 1, False),
+           (-1, -1, False), (-1, -1, True), (1, -1, True), (1, -1, False))
+QUADRANTS = ((1, 1, False), (-1, 1, False), (1, -1, False), (-1, -1, False))
+
+
+def symmetric_points(x, y, symmetry):
+    """Симметричные копии одной точки"""
+    return [(sx * y, sy * x) if swap else (sx * x, sy * y) for sx, sy, swap in symmetry]
+
+
+def symmetric_pattern(steps, symmetry):
+    """Шаблон из шагов первого октанта/четверти: по дуге на каждую копию"""
+    x, y = np.array(list(steps), dtype=np.int32).reshape(-1, 2).T
+    return np.stack([(sx * y, sy * x) if swap else (sx * x, sy * y)
+                     for sx, sy, swap in symmetry]).transpose(0, 2, 1)
+
+
+def circle_pattern(r):
+    return symmetric_pattern(iter_circle(r), OCTANTS)
+
+
+def ellipse_pattern(a, b):
+    return symmetric_pattern(iter_ellipse(a, b), QUADRANTS)
+
+
+def hyperbola_pattern(a, b, xlim, ylim):
+    return symmetric_pattern(iter_hyperbola(a, b, xlim, ylim), QUADRANTS)
+
+
+def parabola_pattern(p, xlim, ylim):
+    """Рисование параболы с двумя точками за шаг до границы видимой области"""
+    if p == 0:
+        return np.zeros((2, 0, 2), dtype=np.int32)
+    # |y| = x^2 / 4|p| растёт с x: последний видимый x находится сразу
+    x_max = min(xlim, int(math.sqrt(4 * abs(p) * (max(ylim, 0) + 0.5))) + 1)
+    x = np.arange(0, max(x_max, -1) + 1)
+    y = np.rint(x ** 2 / (4 * p)).astype(np.int32)
+    visible = np.abs(y) <= ylim
+    x, y = x[visible], y[visible]
+    return np.stack([(x, -y), (-x, -y)]).transpose(0, 2, 1).astype(np.int32)
+
+
+def fill_spans(pattern):
+    """Горизонтальные отрезки заливки замкнутой фигуры по её контуру.
+
+    Возвращает массив (строки, 3): смещение строки y и границы x_left, x_right
+    включительно; по одному отрезку на строку, так что заливка стоит
+    O(высоты), а не O(площади).
+    """
+    points = pattern.reshape(-1, 2)
+    if not len(points):
+        return np.zeros((0, 3), dtype=np.int32)
+    x, y = points.T
+    top = y.min()
+    rows = y.max() - top + 1
+    left = np.full(rows, np.iinfo(np.int32).max, dtype=np.int32)
+    right = np.full(rows, np.iinfo(np.int32).min, dtype=np.int32)
+    np.minimum.at(left, y - top, x)
+    np.maximum.at(right, y - top, x)
+    return np.stack([np.arange(top, top + rows, dtype=np.int32), left, right], axis=1)
+
+
+def extent(x0, y0, width, height):
+    """Наибольшие смещения от центра (x0, y0), ещё видимые в окне width x height"""
+    return max(x0, width - 1 - x0), max(y0, height - 1 - y0)
+
+
+def visible_prefix(pattern, xlim, ylim):
+    """Начало шаблона, лежащее в пределах смещений xlim, ylim.
+
+    Подходит для шаблонов с монотонными |x| и |y| вдоль дуги (гипербола,
+    парабола): видимые точки образуют префикс.
+    """
+    arc = np.abs(pattern[0])
+    n = np.count_nonzero((arc[:, 0] <= xlim) & (arc[:, 1] <= ylim))
+    return pattern[:, :n]
+
+
+class PatternCache:
+    """LRU-кэш растеризованных шаблонов фигур с ограничением по памяти"""
+
+    def __init__(self, max_bytes=16 * 2**20, max_entries=256):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, figure, size1, size2, build, limits=None):
+        """Шаблон по ключу (фигура, размер1, размер2); build() строит его при промахе.
+
+        Для незамкнутых фигур limits = (xlim, ylim) задаёт видимую часть:
+        шаблон, построенный для больших пределов, обрезается до префикса, а
+        при нехватке строится заново через build(xlim, ylim).
+        """
+        key = (figure, size1, size2)
+        entry = self.entries.get(key)
+        if entry is not None:
+            pattern, built = entry
+            if limits is None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return pattern
+            if built[0] >= limits[0] and built[1] >= limits[1]:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return visible_prefix(pattern, *limits)
+            # Строим для объединения пределов, чтобы кэш покрывал оба запроса,
+            # но отдаём только то, что видно в запрошенных
+            union = max(built[0], limits[0]), max(built[1], limits[1])
+            self.misses += 1
+            pattern = build(*union)
+            self.put(key, pattern, union)
+            return visible_prefix(pattern, *limits)
+        self.misses += 1
+        pattern = build() if limits is None else build(*limits)
+        self.put(key, pattern, limits)
+        return pattern
+
+    def put(self, key, pattern, limits=None):
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key)[0].nbytes
+        if pattern.nbytes > self.max_bytes:
+            return  # Слишком большой шаблон не вытесняет весь кэш
+        self.entries[key] = (pattern, limits)
+        self.nbytes += pattern.nbytes
+        while self.nbytes > self.max_bytes or len(self.entries) > self.max_entries:
+            _, (old, _) = self.entries.popitem(last=False)
+            self.nbytes -= old.nbytes
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return f"Кэш: {self.hits} попад. / {self.misses} пром., {self.nbytes / 1024:.0f} КБ"
@@ -1,7 +1,13 @@
 import tkinter as tk
-import time
 import math
 
+import numpy as np
+
+from conics import (OCTANTS, QUADRANTS, PatternCache, circle_pattern, ellipse_pattern, extent, fill_spans,
+                    hyperbola_pattern, iter_circle, iter_ellipse, iter_hyperbola, parabola_pattern,
+                    symmetric_points)
+from scheduler import StepScheduler
+
 class GraphicalEditor:
     def __init__(self, root):
         self.root = root
@@ -31,6 +37,20 @@ class GraphicalEditor:
         self.debug_button = tk.Button(self.control_frame, text="Режим отладки: выкл", command=self.toggle_debug)
         self.debug_button.pack(side=tk.LEFT, padx=5)
 
+        # Кнопка режима заливки окружностей и эллипсов
+        self.fill_mode = False
+        self.fill_button = tk.Button(self.control_frame, text="Заливка: выкл", command=self.toggle_fill)
+        self.fill_button.pack(side=tk.LEFT, padx=5)
+
+        # Кэш растеризованных шаблонов: повторный клик только сдвигает шаблон
+        self.patterns = PatternCache()
+        self.cache_label = tk.Label(self.control_frame, text=self.patterns.stats())
+        self.cache_label.pack(side=tk.LEFT, padx=5)
+
+        # Пошаговая отрисовка в режиме отладки через root.after
+        self.scheduler = StepScheduler(root, budget=1, interval=50, on_change=self.update_debug_controls)
+        self.create_debug_controls()
+
         # Обработчик кликов
         self.canvas.bind("<Button-1>", self.on_canvas_click)
 
@@ -59,11 +79,53 @@ class GraphicalEditor:
         self.debug_mode = not self.debug_mode
         self.debug_button.config(text=f"Режим отладки: {'вкл' if self.debug_mode else 'выкл'}")
 
-    def delay(self):
-        """Замедление для режима отладки"""
-        if self.debug_mode:
-            time.sleep(0.05)
-            self.root.update()
+    def create_debug_controls(self):
+        """Управление пошаговой отрисовкой: пауза, шаг, отмена, скорость"""
+        self.debug_frame = tk.Frame(self.root)
+        self.debug_frame.pack(fill=tk.X, pady=5)
+
+        self.pause_button = tk.Button(self.debug_frame, text="Пауза", command=self.toggle_pause)
+        self.pause_button.pack(side=tk.LEFT, padx=5)
+        tk.Button(self.debug_frame, text="Шаг", command=self.scheduler.step).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.debug_frame, text="Отмена", command=self.scheduler.cancel).pack(side=tk.LEFT, padx=5)
+
+        tk.Label(self.debug_frame, text="Точек за тик:").pack(side=tk.LEFT, padx=5)
+        self.budget_box = tk.Spinbox(self.debug_frame, from_=1, to=10000, width=6, command=self.set_budget)
+        self.budget_box.pack(side=tk.LEFT)
+        self.budget_box.bind("<Return>", lambda event: self.set_budget())
+
+        self.speed_scale = tk.Scale(self.debug_frame, from_=1, to=500, orient=tk.HORIZONTAL,
+                                    label="Интервал, мс", command=self.set_interval)
+        self.speed_scale.set(self.scheduler.interval)
+        self.speed_scale.pack(side=tk.LEFT, padx=5)
+
+        self.debug_status = tk.Label(self.debug_frame, text="")
+        self.debug_status.pack(side=tk.LEFT, padx=5)
+
+    def set_budget(self):
+        try:
+            self.scheduler.budget = max(1, int(self.budget_box.get()))
+        except ValueError:
+            pass
+
+    def set_interval(self, value):
+        self.scheduler.interval = int(float(value))
+
+    def toggle_pause(self):
+        if self.scheduler.paused:
+            self.scheduler.resume()
+        else:
+            self.scheduler.pause()
+
+    def update_debug_controls(self):
+        self.pause_button.config(text="Продолжить" if self.scheduler.paused else "Пауза")
+        jobs = len(self.scheduler.jobs)
+        self.debug_status.config(text=f"В очереди: {jobs}" if jobs else "")
+
+    def toggle_fill(self):
+        """Переключение режима заливки"""
+        self.fill_mode = not self.fill_mode
+        self.fill_button.config(text=f"Заливка: {'вкл' if self.fill_mode else 'выкл'}")
 
     def get_sizes(self):
         """Получение введённых размеров"""
@@ -91,84 +153,94 @@ class GraphicalEditor:
         """Рисует точку на холсте и выводит её координаты в консоль"""
         self.canvas.create_oval(x, y, x+1, y+1, fill=color)
         print(f"{self.figure_type.capitalize()}: (x={x}, y={y})")
-        self.delay()
+
+    def symmetric_steps(self, steps, symmetry, x0, y0):
+        """Точки фигуры прямо из генератора алгоритма, шаг за шагом"""
+        for x, y in steps:
+            for dx, dy in symmetric_points(x, y, symmetry):
+                yield x0 + dx, y0 + dy
+
+    def draw_pattern(self, pattern, x0, y0):
+        """Рисует шаблон с центром в (x0, y0)"""
+        if self.debug_mode:
+            # По точке в порядке шагов алгоритма, чтобы был виден ход построения
+            points = pattern.transpose(1, 0, 2).reshape(-1, 2) + (x0, y0)
+            self.scheduler.start(points.tolist(), lambda point: self.draw_point(*point))
+        else:
+            self.draw_arcs(pattern + (x0, y0))
+        self.cache_label.config(text=self.patterns.stats())
+
+    def draw_arcs(self, arcs, color="black"):
+        """Выводит каждую дугу одной ломаной: соседние точки дуги - соседние пиксели"""
+        for arc in arcs:
+            if len(arc) == 0:
+                continue
+            if len(arc) == 1:
+                arc = np.vstack([arc, arc + (1, 0)])
+            self.canvas.create_line(arc.ravel().tolist(), fill=color, capstyle=tk.PROJECTING)
+
+    def draw_spans(self, spans, x0, y0, color="black"):
+        """Заливка: один create_line на строку"""
+        spans = (spans + (y0, x0, x0)).tolist()
+        draw = lambda span: self.canvas.create_line(span[1], span[0], span[2] + 1, span[0], fill=color)
+        if self.debug_mode:
+            self.scheduler.start(spans, draw)
+        else:
+            for span in spans:
+                draw(span)
+        self.cache_label.config(text=self.patterns.stats())
 
     def draw_circle(self, x0, y0, r):
         """Алгоритм рисования окружности (Брезенхэм)"""
-        x, y, d = 0, r, 3 - 2 * r
-        while x <= y:
-            for dx, dy in [(x, y), (y, x), (-y, x), (-x, y), (-x, -y), (-y, -x), (y, -x), (x, -y)]:
-                self.draw_point(x0+dx, y0+dy)
-            x += 1
-            if d > 0:
-                y -= 1
-                d += 4 * (x - y) + 10
-            else:
-                d += 4 * x + 6
+        if self.debug_mode and not self.fill_mode:
+            self.scheduler.start(self.symmetric_steps(iter_circle(r), OCTANTS, x0, y0),
+                                 lambda point: self.draw_point(*point))
+            return
+        pattern = self.patterns.get("circle", r, 0, lambda: circle_pattern(r))
+        if self.fill_mode:
+            spans = self.patterns.get("circle_fill", r, 0, lambda: fill_spans(pattern))
+            self.draw_spans(spans, x0, y0)
+        else:
+            self.draw_pattern(pattern, x0, y0)
 
     def draw_ellipse(self, x0, y0, a, b):
         """Алгоритм рисования эллипса"""
-        x, y = 0, b
-        d1 = b**2 - a**2 * b + 0.25 * a**2
-
-        while (a**2) * (y - 0.5) > (b**2) * (x + 1):
-            for dx, dy in [(x, y), (-x, y), (x, -y), (-x, -y)]:
-                self.draw_point(x0+dx, y0+dy)
-            x += 1
-            if d1 < 0:
-                d1 += (2 * b**2) * x + b**2
-            else:
-                y -= 1
-                d1 += (2 * b**2) * x - (2 * a**2) * y + b**2
-
-        d2 = b**2 * (x + 0.5) ** 2 + a**2 * (y - 1) ** 2 - a**2 * b**2
-        while y >= 0:
-            for dx, dy in [(x, y), (-x, y), (x, -y), (-x, -y)]:
-                self.draw_point(x0+dx, y0+dy)
-            y -= 1
-            if d2 > 0:
-                d2 += a**2 - 2 * a**2 * y
-            else:
-                x += 1
-                d2 += (2 * b**2) * x - (2 * a**2) * y + a**2
+        if self.debug_mode and not self.fill_mode:
+            self.scheduler.start(self.symmetric_steps(iter_ellipse(a, b), QUADRANTS, x0, y0),
+                                 lambda point: self.draw_point(*point))
+            return
+        pattern = self.patterns.get("ellipse", a, b, lambda: ellipse_pattern(a, b))
+        if self.fill_mode:
+            spans = self.patterns.get("ellipse_fill", a, b, lambda: fill_spans(pattern))
+            self.draw_spans(spans, x0, y0)
+        else:
+            self.draw_pattern(pattern, x0, y0)
+
+    def visible_limits(self, x0, y0):
+        """Пределы смещений от центра, видимые на холсте"""
+        return extent(x0, y0, int(self.canvas.cget("width")), int(self.canvas.cget("height")))
 
     def draw_hyperbola(self, x0, y0, a, b):
         """Рисование гиперболы"""
-        x, y = a, 0
-
-        d1 = b ** 2 * (x + 0.5) ** 2 - a ** 2 * (y + 1) ** 2 - a ** 2 * b ** 2
-        while (b ** 2) * (x - 0.5) > (a ** 2) * (y + 1):
-            for dx, dy in [(x, y), (-x, y), (x, -y), (-x, -y)]:
-                self.draw_point(x0 + dx, y0 + dy)
-
-            y += 1
-            if d1 < 0:
-                d1 += (2 * a ** 2) * y + a ** 2
-            else:
-                x += 1
-                d1 += (2 * a ** 2) * y - (2 * b ** 2) * x + a ** 2
-
-        d2 = b ** 2 * (x + 1) ** 2 - a ** 2 * (y + 0.5) ** 2 - a ** 2 * b ** 2
-        while x < 200:
-            for dx, dy in [(x, y), (-x, y), (x, -y), (-x, -y)]:
-                self.draw_point(x0 + dx, y0 + dy)
-
-            x += 1
-            if d2 > 0:
-                d2 += b ** 2 - (2 * b ** 2) * x
-            else:
-                y += 1
-                d2 += (2 * a ** 2) * y - (2 * b ** 2) * x + b ** 2
+        limits = self.visible_limits(x0, y0)
+        if self.debug_mode:
+            self.scheduler.start(self.symmetric_steps(iter_hyperbola(a, b, *limits), QUADRANTS, x0, y0),
+                                 lambda point: self.draw_point(*point))
+            return
+        pattern = self.patterns.get("hyperbola", a, b, lambda xlim, ylim: hyperbola_pattern(a, b, xlim, ylim),
+                                    limits)
+        self.draw_pattern(pattern, x0, y0)
 
     def draw_parabola(self, x0, y0, p):
         """Рисование параболы с двумя точками за шаг"""
-        step = 1
-        x = 0
-        while x <= 200:
-            y = (x ** 2) / (4 * p)
-            self.draw_point(x0 + x, y0 - y)
-            self.draw_point(x0 - x, y0 - y)
-            x += step
+        # Ветви идут вверх при p > 0 и вниз при p < 0
+        xlim, _ = self.visible_limits(x0, y0)
+        ylim = y0 if p > 0 else int(self.canvas.cget("height")) - 1 - y0
+        pattern = self.patterns.get("parabola", p, 0, lambda xlim, ylim: parabola_pattern(p, xlim, ylim),
+                                    (xlim, ylim))
+        self.draw_pattern(pattern, x0, y0)
+
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = GraphicalEditor(root)
@@ -0,0 +1,80 @@
+from collections import deque
+
+
+class StepScheduler:
+    """Пошаговое выполнение генераторов через root.after, не блокируя интерфейс.
+
+    Каждое задание - генератор элементов (точек, отрезков заливки) и функция
+    их отрисовки. За один тик обрабатывается не больше budget элементов,
+    тики идут с интервалом interval мс. Задания выполняются по очереди.
+    """
+
+    def __init__(self, root, budget=1, interval=50, on_change=None):
+        self.root = root
+        self.budget = budget
+        self.interval = interval
+        self.on_change = on_change
+        self.jobs = deque()
+        self.paused = False
+        self.after_id = None
+
+    @property
+    def busy(self):
+        return bool(self.jobs)
+
+    def start(self, items, draw):
+        """Ставит генератор в очередь и запускает тики, если они не идут"""
+        self.jobs.append((iter(items), draw))
+        self.schedule()
+        self.notify()
+
+    def schedule(self):
+        if self.after_id is None and self.jobs and not self.paused:
+            self.after_id = self.root.after(self.interval, self.tick)
+
+    def tick(self):
+        self.after_id = None
+        self.advance(self.budget)
+        self.schedule()
+
+    def advance(self, count):
+        """Обрабатывает до count элементов текущих заданий"""
+        while count > 0 and self.jobs:
+            items, draw = self.jobs[0]
+            for item in items:
+                draw(item)
+                count -= 1
+                if count == 0:
+                    break
+            else:
+                self.jobs.popleft()
+                self.notify()
+
+    def pause(self):
+        self.paused = True
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.notify()
+
+    def resume(self):
+        self.paused = False
+        self.schedule()
+        self.notify()
+
+    def step(self):
+        """Один элемент вне очереди тиков (для паузы)"""
+        self.advance(1)
+        self.notify()
+
+    def cancel(self):
+        """Прерывает все задания"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.jobs.clear()
+        self.notify()
+
+    def notify(self):
+        if self.on_change is not None:
+            self.on_change()
@@ -0,0 +1,165 @@
+"""Замеры движка кривых без Tk.
+
+    python benchmark.py tessellation --tolerance 0.5
+    python benchmark.py picking --sizes 1000 100000 1000000
+    python benchmark.py forward --points 1000 100000 --samples 100 10000
+    python benchmark.py simplify --tolerance 0.25 0.5 1 2
+
+tessellation - сколько точек даёт адаптивное разбиение на эталонных
+кривых по сравнению с равномерным шагом 100 точек на сегмент и
+наибольшее отклонение полученной ломаной от кривой.
+picking - время выбора точки сеткой и прежним линейным перебором.
+forward - точки в секунду матричного вычисления и прямых разностей и
+наибольшее отклонение разностей с периодическим пересчётом и без него.
+simplify - во сколько раз упрощение Дугласа-Пекера сокращает число
+вершин эталонных кривых после равномерного шага и после адаптивного
+разбиения.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from curves import (STRIDE, bezier_controls, coefficients, evaluate, forward_differences, segment_starts, simplify,
+                    tessellate)
+from spatial import PointGrid
+
+
+def reference_curves():
+    """Эталонные наборы опорных точек на холсте 800x600"""
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 1, 61)
+    return {
+        "zigzag": rng.uniform((0, 0), (800, 600), size=(61, 2)),
+        "wave": np.stack([40 + 720 * t, 300 + 200 * np.sin(12 * np.pi * t)], axis=1),
+        "spiral": np.stack([400 + 280 * t * np.cos(16 * np.pi * t), 300 + 280 * t * np.sin(16 * np.pi * t)], axis=1),
+        "dense": np.stack([100 + 60 * t, 300 + 5 * np.cos(40 * np.pi * t)], axis=1),
+    }
+
+
+def polyline_error(polyline, curve):
+    """Наибольшее расстояние от точек кривой до ломаной, в пикселях"""
+    a, b = polyline[None, :-1], polyline[None, 1:]
+    p = curve[:, None]
+    ab = b - a
+    t = np.clip(np.sum((p - a) * ab, axis=2) / np.maximum(np.sum(ab * ab, axis=2), 1e-12), 0, 1)
+    return float(np.linalg.norm(p - (a + t[..., None] * ab), axis=2).min(axis=1).max())
+
+
+def run_tessellation(tolerance, step=100):
+    for name, points in reference_curves().items():
+        for kind in STRIDE:
+            polylines = tessellate(bezier_controls(kind, points), tolerance)
+            dense = evaluate(kind, points, 1000)
+            adaptive = sum(len(polyline) for polyline in polylines)
+            fixed = len(polylines) * step
+            error = max(polyline_error(polyline, curve) for polyline, curve in zip(polylines, dense))
+            print(f"{name:<7} {kind:<8} fixed: {fixed:7d} adaptive: {adaptive:7d} "
+                  f"saved: {100 * (1 - adaptive / fixed):5.1f}% max error: {error:.3f} px")
+
+
+def linear_pick(points, x, y, radius):
+    """Прежний выбор точки перебором всего списка"""
+    selected, min_dist = None, float("inf")
+    for i, (px, py) in enumerate(points):
+        dist = (px - x) ** 2 + (py - y) ** 2
+        if dist < radius * radius and dist < min_dist:
+            min_dist, selected = dist, i
+    return selected
+
+
+def run_picking(sizes, radius=10, queries=1000, linear_queries=20):
+    for size in sizes:
+        # Плотность как у холста 800x600 с тысячей точек
+        side = int(np.sqrt(size * 800 * 600 / 1000))
+        rng = np.random.default_rng(0)
+        points = [tuple(p) for p in rng.integers(0, side, size=(size, 2)).tolist()]
+        clicks = rng.integers(0, side, size=(queries, 2)).tolist()
+
+        start = time.perf_counter()
+        grid = PointGrid(cell=radius)
+        for i, (x, y) in enumerate(points):
+            grid.add(i, x, y)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        picked = [grid.nearest(points, x, y, radius) for x, y in clicks]
+        grid_time = (time.perf_counter() - start) / queries
+
+        start = time.perf_counter()
+        expected = [linear_pick(points, x, y, radius) for x, y in clicks[:linear_queries]]
+        linear_time = (time.perf_counter() - start) / linear_queries
+
+        same = picked[:linear_queries] == expected
+        print(f"points={size:<8} build: {build:7.3f} s grid: {grid_time * 1e6:8.1f} us/pick "
+              f"linear: {linear_time * 1e6:10.1f} us/pick speedup: {linear_time / grid_time:8.0f}x "
+              f"identical: {same}")
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run_forward(point_counts, sample_counts, kind="bspline"):
+    rng = np.random.default_rng(0)
+    for n_points in point_counts:
+        points = rng.uniform(0, 800, size=(n_points, 2))
+        starts = segment_starts(kind, n_points)
+        for samples in sample_counts:
+            if len(starts) * samples > 20_000_000:
+                continue
+            exact, matrix_time = timed(lambda: evaluate(kind, points, samples))
+            forward, forward_time = timed(lambda: evaluate(kind, points, samples, method="forward"))
+            drift = forward_differences(coefficients(kind, points, starts), samples, resync=samples)
+            total = exact.shape[0] * samples
+            print(f"{kind} points={n_points:<7} samples={samples:<6} "
+                  f"matrix: {total / matrix_time / 1e6:7.2f} Mpt/s "
+                  f"forward: {total / forward_time / 1e6:7.2f} Mpt/s "
+                  f"max dev: {np.abs(forward - exact).max():.2e} px "
+                  f"(no resync: {np.abs(drift - exact).max():.2e} px)")
+
+
+def run_simplify(tolerances, step=100):
+    for name, points in reference_curves().items():
+        for kind in STRIDE:
+            fixed = evaluate(kind, points, step)
+            adaptive = tessellate(bezier_controls(kind, points))
+            for tolerance in tolerances:
+                (from_fixed, from_adaptive), elapsed = timed(lambda: (
+                    [simplify(polyline, tolerance) for polyline in fixed],
+                    [simplify(polyline, tolerance) for polyline in adaptive]))
+                error = max(polyline_error(simple, curve) for simple, curve in zip(from_fixed, fixed))
+                raw, simple = fixed.shape[0] * step, sum(len(polyline) for polyline in from_fixed)
+                tessellated = sum(len(polyline) for polyline in adaptive)
+                reduced = sum(len(polyline) for polyline in from_adaptive)
+                print(f"{name:<7} {kind:<8} tol={tolerance:<5} "
+                      f"step {step}: {raw:6d} -> {simple:5d} ({raw / simple:5.1f}x, err {error:.3f} px) "
+                      f"adaptive: {tessellated:5d} -> {reduced:5d} ({tessellated / reduced:4.2f}x) "
+                      f"{elapsed * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замеры движка кривых")
+    commands = parser.add_subparsers(dest="command", required=True)
+    tessellation = commands.add_parser("tessellation", help="адаптивное разбиение против шага 100")
+    tessellation.add_argument("--tolerance", type=float, default=0.5, help="допуск, пиксели")
+    picking = commands.add_parser("picking", help="выбор точки сеткой против перебора")
+    picking.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    forward = commands.add_parser("forward", help="прямые разности против матричной формы")
+    forward.add_argument("--points", type=int, nargs="+", default=[1000, 100_000])
+    forward.add_argument("--samples", type=int, nargs="+", default=[100, 10_000])
+    forward.add_argument("--kind", choices=sorted(STRIDE), default="bspline")
+    simple = commands.add_parser("simplify", help="сокращение вершин упрощением Дугласа-Пекера")
+    simple.add_argument("--tolerance", type=float, nargs="+", default=[0.25, 0.5, 1.0, 2.0])
+    args = parser.parse_args()
+
+    if args.command == "tessellation":
+        run_tessellation(args.tolerance)
+    elif args.command == "picking":
+        run_picking(args.sizes)
+    elif args.command == "forward":
+        run_forward(args.points, args.samples, args.kind)
+    elif args.command == "simplify":
+        run_simplify(args.tolerance)
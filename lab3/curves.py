@@ -0,0 +1,296 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Базисные матрицы: точка сегмента = T(t) @ M @ G, T(t) = [t^3, t^2, t, 1],
+# G - четыре геометрических вектора сегмента
+BASIS = {
+    "bezier": np.array([
+        [-1,  3, -3, 1],
+        [ 3, -6,  3, 0],
+        [-3,  3,  0, 0],
+        [ 1,  0,  0, 0]
+    ], dtype=float),
+    # Эрмит: G = [p0, p3, p1 - p0, p2 - p3] (концы и касательные)
+    "hermite": np.array([
+        [ 2, -2,  1,  1],
+        [-3,  3, -2, -1],
+        [ 0,  0,  1,  0],
+        [ 1,  0,  0,  0]
+    ], dtype=float),
+    "bspline": np.array([
+        [-1,  3, -3,  1],
+        [ 3, -6,  3,  0],
+        [-3,  0,  3,  0],
+        [ 1,  4,  1,  0]
+    ], dtype=float) / 6,
+}
+
+# Шаг между началами соседних сегментов в списке точек
+STRIDE = {"bezier": 1, "hermite": 3, "bspline": 1}
+
+# Способы вычисления точек: произведение с таблицей T(t) @ M или прямые разности
+METHODS = ("matrix", "forward")
+
+
+@lru_cache(maxsize=32)
+def basis_table(kind, samples):
+    """Произведение T(t) @ M для samples равномерных значений t, (samples, 4)"""
+    t = np.linspace(0, 1, samples)
+    T = np.stack([t**3, t**2, t, np.ones_like(t)], axis=1)
+    table = T @ BASIS[kind]
+    table.flags.writeable = False
+    return table
+
+
+def segment_starts(kind, n_points):
+    """Индексы первых точек всех сегментов кривой"""
+    if n_points < 4:
+        return np.zeros(0, dtype=int)
+    return np.arange(0, n_points - 3, STRIDE[kind])
+
+
+def geometry(kind, points, starts):
+    """Геометрические векторы сегментов, (сегменты, 4, 2)"""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    windows = points[starts[:, None] + np.arange(4)]
+    if kind == "hermite":
+        p0, p1, p2, p3 = windows.transpose(1, 0, 2)
+        windows = np.stack([p0, p3, p1 - p0, p2 - p3], axis=1)
+    return windows
+
+
+def coefficients(kind, points, starts):
+    """Коэффициенты a, b, c, d многочленов a t^3 + b t^2 + c t + d, (сегменты, 4, 2)"""
+    return np.einsum("ij,njd->nid", BASIS[kind], geometry(kind, points, starts))
+
+
+def forward_differences(coeffs, samples, resync=32):
+    """Точки кубиков прямыми разностями: три сложения на координату на точку.
+
+    Каждые resync шагов значение и разности вычисляются заново точно,
+    чтобы ошибка округления не накапливалась вдоль длинных сегментов.
+    """
+    a, b, c, d = coeffs.transpose(1, 0, 2)
+    h = 1 / max(samples - 1, 1)
+    out = np.empty((len(coeffs), samples, 2))
+    for i in range(samples):
+        if i % resync == 0:
+            t = i * h
+            f = ((a * t + b) * t + c) * t + d
+            d1 = a * (3 * t * t * h + 3 * t * h * h + h ** 3) + b * (2 * t * h + h * h) + c * h
+            d2 = a * (6 * t * h * h + 6 * h ** 3) + 2 * b * h * h
+            d3 = 6 * a * h ** 3
+        out[:, i] = f
+        f += d1
+        d1 += d2
+        d2 += d3
+    return out
+
+
+def evaluate(kind, points, samples=100, starts=None, method="matrix"):
+    """Точки всех сегментов кривой одним вызовом, (сегменты, samples, 2)"""
+    if starts is None:
+        starts = segment_starts(kind, len(points))
+    if len(starts) == 0:
+        return np.zeros((0, samples, 2))
+    if method == "forward":
+        return forward_differences(coefficients(kind, points, starts), samples)
+    return np.einsum("sk,nkd->nsd", basis_table(kind, samples), geometry(kind, points, starts))
+
+
+def affected_segments(kind, index, n_points):
+    """Начала сегментов, зависящих от точки index: сегмент s использует точки s..s+3"""
+    if n_points < 4:
+        return np.zeros(0, dtype=int)
+    stride = STRIDE[kind]
+    first = max(0, -(-(index - 3) // stride))
+    last = min(index // stride, (n_points - 4) // stride)
+    return np.arange(first, last + 1) * stride
+
+
+# Переход от геометрии сегмента к контрольным точкам Безье того же кубика
+TO_BEZIER = {kind: np.linalg.solve(BASIS["bezier"], basis) for kind, basis in BASIS.items()}
+
+
+def bezier_controls(kind, points, starts=None):
+    """Контрольные точки Безье всех сегментов кривой, (сегменты, 4, 2)"""
+    if starts is None:
+        starts = segment_starts(kind, len(points))
+    if len(starts) == 0:
+        return np.zeros((0, 4, 2))
+    return np.einsum("ij,njd->nid", TO_BEZIER[kind], geometry(kind, points, starts))
+
+
+def flatness(pieces):
+    """Наибольшее расстояние внутренних контрольных точек до хорды p0-p3"""
+    p0, p3 = pieces[:, :1], pieces[:, 3:]
+    chord = p3 - p0
+    length2 = np.sum(chord ** 2, axis=2)
+    inner = pieces[:, 1:3] - p0
+    t = np.clip(np.sum(inner * chord, axis=2) / np.where(length2 > 0, length2, 1), 0, 1)
+    return np.sqrt(np.max(np.sum((inner - t[..., None] * chord) ** 2, axis=2), axis=1))
+
+
+def split(pieces):
+    """Деление кубиков Безье пополам (де Кастельжо), половины идут подряд"""
+    p0, p1, p2, p3 = pieces.transpose(1, 0, 2)
+    p01, p12, p23 = (p0 + p1) / 2, (p1 + p2) / 2, (p2 + p3) / 2
+    p012, p123 = (p01 + p12) / 2, (p12 + p23) / 2
+    mid = (p012 + p123) / 2
+    left = np.stack([p0, p01, p012, mid], axis=1)
+    right = np.stack([mid, p123, p23, p3], axis=1)
+    return np.stack([left, right], axis=1).reshape(-1, 4, 2)
+
+
+def tessellate(controls, tolerance=0.5, max_depth=16):
+    """Адаптивное разбиение сегментов Безье до плоскости с допуском tolerance пикселей.
+
+    Деление идёт по уровням сразу для всех сегментов: неплоские куски
+    заменяются своими половинами на том же месте, так что порядок кусков
+    вдоль кривой сохраняется. Возвращает ломаные по одной на сегмент.
+    """
+    pieces = np.asarray(controls, dtype=float).reshape(-1, 4, 2)
+    owner = np.arange(len(pieces))
+    for _ in range(max_depth):
+        rough = flatness(pieces) > tolerance
+        if not rough.any():
+            break
+        counts = np.where(rough, 2, 1)
+        position = np.cumsum(counts) - counts
+        refined = np.empty((counts.sum(), 4, 2))
+        refined[position[~rough]] = pieces[~rough]
+        halves = split(pieces[rough])
+        refined[position[rough]] = halves[0::2]
+        refined[position[rough] + 1] = halves[1::2]
+        pieces, owner = refined, np.repeat(owner, counts)
+
+    bounds = np.searchsorted(owner, np.arange(len(controls) + 1))
+    return [np.vstack([pieces[lo:hi, 0], pieces[hi - 1, 3]])
+            for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def evaluate_at(kind, points, segments, t):
+    """Точки кривой в сегментах segments при параметрах t (массивы одной длины)"""
+    t = np.asarray(t, dtype=float)
+    starts = np.asarray(segments, dtype=int) * STRIDE[kind]
+    T = np.stack([t**3, t**2, t, np.ones_like(t)], axis=-1)
+    return np.einsum("nk,nkd->nd", T @ BASIS[kind], geometry(kind, points, starts))
+
+
+class ArcLengthTable:
+    """Таблица длины дуги кривой для выборки точек по расстоянию вдоль неё.
+
+    Для каждого сегмента хранится накопленная длина ломаной по samples
+    равномерным значениям t. Изменённые сегменты только помечаются и
+    пересчитываются при следующем обращении, остальные не трогаются.
+    """
+
+    def __init__(self, kind, samples=64, method="matrix"):
+        self.kind = kind
+        self.samples = samples
+        self.method = method
+        self.lengths = np.zeros((0, samples))  # Длина от начала сегмента
+        self.dirty = set()
+        self.cumulative = None  # Длина от начала кривой, все сегменты подряд
+
+    def reset(self, kind, n_segments):
+        self.kind = kind
+        self.lengths = np.zeros((n_segments, self.samples))
+        self.dirty = set(range(n_segments))
+        self.cumulative = None
+
+    def resize(self, n_segments):
+        """Новые сегменты в конце кривой"""
+        old = len(self.lengths)
+        if n_segments > old:
+            self.lengths = np.vstack([self.lengths, np.zeros((n_segments - old, self.samples))])
+            self.invalidate(range(old, n_segments))
+
+    def invalidate(self, segments):
+        self.dirty.update(int(segment) for segment in segments)
+        self.cumulative = None
+
+    def refresh(self, points):
+        """Пересчёт помеченных сегментов.
+
+        Берётся только окно точек от первого до последнего помеченного
+        сегмента, а не весь список.
+        """
+        if self.dirty:
+            segments = np.array(sorted(self.dirty))
+            starts = segments * STRIDE[self.kind]
+            first = int(starts[0])
+            window = points[first:int(starts[-1]) + 4]
+            curve = evaluate(self.kind, window, self.samples, starts - first, self.method)
+            steps = np.linalg.norm(np.diff(curve, axis=1), axis=2)
+            self.lengths[segments, 1:] = np.cumsum(steps, axis=1)
+            self.dirty.clear()
+
+    def accumulated(self, points):
+        """Накопленная длина по всей кривой; строится заново только после изменений"""
+        self.refresh(points)
+        if self.cumulative is None:
+            offsets = np.concatenate([[0.0], np.cumsum(self.lengths[:, -1])[:-1]])
+            self.cumulative = (self.lengths + offsets[:, None]).ravel()
+        return self.cumulative
+
+    def total(self, points):
+        """Длина кривой: сумма длин сегментов, без накопленной таблицы"""
+        self.refresh(points)
+        return float(self.lengths[:, -1].sum())
+
+    def params_at(self, points, distances):
+        """Сегменты и параметры t точек на расстояниях distances от начала кривой.
+
+        Двоичный поиск по накопленной длине (O(log n) на запрос) и линейная
+        интерполяция между соседними отсчётами; принимает и скаляр, и массив.
+        """
+        cumulative = self.accumulated(points)
+        if not len(cumulative):
+            raise ValueError("у кривой нет ни одного сегмента")
+        distances = np.clip(np.asarray(distances, dtype=float), 0, cumulative[-1])
+        index = np.clip(np.searchsorted(cumulative, distances, side="right") - 1, 0, len(cumulative) - 2)
+        # Последний отсчёт сегмента совпадает с первым следующего: шаг между ними пуст
+        index -= (index % self.samples == self.samples - 1)
+        span = cumulative[index + 1] - cumulative[index]
+        frac = np.clip(np.divide(distances - cumulative[index], span,
+                                 out=np.zeros_like(span), where=span > 0), 0, 1)
+        segments, sample = np.divmod(index, self.samples)
+        return segments, (sample + frac) / (self.samples - 1)
+
+    def points_at(self, points, distances):
+        """Точки на расстояниях distances вдоль кривой"""
+        segments, t = self.params_at(points, np.atleast_1d(distances))
+        return evaluate_at(self.kind, points, segments, t)
+
+
+def simplify(polyline, tolerance):
+    """Упрощение ломаной алгоритмом Дугласа-Пекера.
+
+    Оставляет вершины так, чтобы каждая отброшенная лежала не дальше
+    tolerance пикселей от получившейся ломаной; концы сохраняются всегда.
+    """
+    polyline = np.asarray(polyline, dtype=float)
+    n = len(polyline)
+    if n < 3 or tolerance <= 0:
+        return polyline
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+        a, chord = polyline[lo], polyline[hi] - polyline[lo]
+        inner = polyline[lo + 1:hi] - a
+        length2 = chord @ chord
+        t = np.clip(inner @ chord / length2, 0, 1) if length2 > 0 else np.zeros(len(inner))
+        distance = np.sum((inner - t[:, None] * chord) ** 2, axis=1)
+        k = int(np.argmax(distance))
+        if distance[k] > tolerance * tolerance:
+            mid = lo + 1 + k
+            keep[mid] = True
+            stack.append((lo, mid))
+            stack.append((mid, hi))
+    return polyline[keep]
@@ -1,6 +1,49 @@
+import time
 import tkinter as tk
+from collections import deque
+
 import numpy as np
 
+from curves import (METHODS, STRIDE, ArcLengthTable, affected_segments, bezier_controls, segment_starts, simplify,
+                    tessellate)
+from spatial import PointGrid
+
+CURVE_COLORS = {"bezier": "black", "hermite": "blue", "bspline": "green"}
+# Кривые, у которых конец сегмента совпадает с началом следующего: такие
+# выводятся одной ломаной; сегменты Безье со скользящим окном не стыкуются
+CONTINUOUS = {"hermite", "bspline"}
+PICK_RADIUS = 10  # Радиус выбора опорной точки, пиксели
+METHOD_NAMES = {"matrix": "матрица", "forward": "разности"}
+
+
+class FrameStats:
+    """Время кадров перетаскивания, частота перерисовки и число пропущенных событий"""
+
+    def __init__(self, window=30):
+        self.times = deque(maxlen=window)  # Моменты окончания последних кадров
+        self.last = 0.0  # Длительность последнего кадра, с
+        self.events = 0
+        self.dropped = 0
+
+    def reset(self):
+        self.times.clear()
+        self.last = 0.0
+        self.events = 0
+        self.dropped = 0
+
+    def frame(self, start, end):
+        self.last = end - start
+        self.times.append(end)
+
+    def fps(self):
+        if len(self.times) < 2:
+            return 0.0
+        return (len(self.times) - 1) / max(self.times[-1] - self.times[0], 1e-9)
+
+    def text(self):
+        return (f"{self.fps():.0f} кадр/с, кадр {self.last * 1000:.1f} мс, "
+                f"пропущено {self.dropped} из {self.events}")
+
 class CurveEditor:
     def __init__(self, root):
         self.root = root
@@ -10,8 +53,34 @@ class CurveEditor:
         self.canvas.pack()
 
         self.points = []
+        self.grid = PointGrid(cell=PICK_RADIUS)  # Сетка для выбора точки за O(1)
         self.selected_point = None
         self.current_curve = "bezier"
+        self.step = 100  # Точек на сегмент при равномерном шаге, для сравнения
+        self.tolerance = 0.5  # Допуск адаптивного разбиения, пиксели
+        self.simplify_tolerance = 0.5  # Допуск упрощения ломаной, пиксели
+
+        # Ломаные сегментов после упрощения (плоские списки координат) и
+        # число точек до упрощения; при перетаскивании пересчитываются только
+        # затронутые сегменты
+        self.segment_polylines = []
+        self.segment_sizes = []
+        # Суммы по сегментам: вершин после и до упрощения; при замене сегмента
+        # меняются на разность, чтобы не пересчитывать их каждый кадр
+        self.drawn_vertices = 0
+        self.source_vertices = 0
+        # Непрерывная кривая: общий список координат и начало каждого сегмента
+        # в нём; изменённые сегменты вставляются на своё место
+        self.curve_coords = []
+        self.segment_offsets = np.zeros(0, dtype=int)
+
+        # Элементы холста: по овалу на опорную точку и по ломаной на кривую,
+        # чтобы при перетаскивании сдвигать их через coords()
+        self.point_items = []
+        self.curve_items = []
+
+        # Длина дуги по сегментам: пересчитываются только изменённые
+        self.arc_lengths = ArcLengthTable(self.current_curve)
 
         self.buttons_frame = tk.Frame(root)
         self.buttons_frame.pack()
@@ -20,6 +89,25 @@ class CurveEditor:
         tk.Button(self.buttons_frame, text="Эрмит", command=lambda: self.set_curve("hermite")).pack(side=tk.LEFT)
         tk.Button(self.buttons_frame, text="B-сплайн", command=lambda: self.set_curve("bspline")).pack(side=tk.LEFT)
         tk.Button(self.buttons_frame, text="Очистить", command=self.clear_canvas).pack(side=tk.LEFT)
+        self.samples_label = tk.Label(self.buttons_frame, text="")
+        self.samples_label.pack(side=tk.LEFT, padx=5)
+        self.length_label = tk.Label(self.buttons_frame, text="")
+        self.length_label.pack(side=tk.LEFT, padx=5)
+        self.method_button = tk.Button(self.buttons_frame, command=self.toggle_method,
+                                       text=f"Вычисление: {METHOD_NAMES[self.arc_lengths.method]}")
+        self.method_button.pack(side=tk.LEFT, padx=5)
+        self.frame_label = tk.Label(self.buttons_frame, text="")
+        self.frame_label.pack(side=tk.LEFT, padx=5)
+        self.simplify_scale = tk.Scale(self.buttons_frame, from_=0, to=5, resolution=0.1, orient=tk.HORIZONTAL,
+                                       label="Упрощение, пикс.", command=self.set_simplify_tolerance)
+        self.simplify_scale.set(self.simplify_tolerance)
+        self.simplify_scale.pack(side=tk.LEFT, padx=5)
+
+        # События перемещения сливаются: рисуется только последнее положение,
+        # кадр выполняется через after_idle, когда очередь событий пуста
+        self.pending_move = None
+        self.frame_job = None
+        self.frame_stats = FrameStats()
 
         self.canvas.bind("<Button-1>", self.on_click)
         self.canvas.bind("<B1-Motion>", self.on_drag)
@@ -29,109 +117,195 @@ class CurveEditor:
         self.current_curve = curve_type
         self.redraw()
 
+    def toggle_method(self):
+        """Переключение способа вычисления точек кривой: матрица или прямые разности"""
+        method = METHODS[(METHODS.index(self.arc_lengths.method) + 1) % len(METHODS)]
+        self.arc_lengths.method = method
+        self.arc_lengths.invalidate(range(len(self.segment_polylines)))
+        self.method_button.config(text=f"Вычисление: {METHOD_NAMES[method]}")
+        self.update_length()
+
+    def set_simplify_tolerance(self, value):
+        if float(value) != self.simplify_tolerance:
+            self.simplify_tolerance = float(value)
+            self.redraw()
+
     def clear_canvas(self):
+        self.pending_move = None
         self.points = []
+        self.grid.clear()
+        self.point_items = []
+        self.curve_items = []
+        self.segment_polylines = []
+        self.segment_sizes = []
+        self.drawn_vertices = 0
+        self.source_vertices = 0
+        self.curve_coords = []
+        self.segment_offsets = np.zeros(0, dtype=int)
+        self.arc_lengths.reset(self.current_curve, 0)
         self.canvas.delete("all")
+        self.update_samples()
+        self.update_length()
 
     def on_click(self, event):
         """Добавление или выбор ближайшей точки"""
-        self.selected_point = None
-        min_dist = float('inf')
-
-        for i, (x, y) in enumerate(self.points):
-            dist = (x - event.x) ** 2 + (y - event.y) ** 2
-            if dist < 100:
-                if dist < min_dist:
-                    min_dist = dist
-                    self.selected_point = i
-
+        self.selected_point = self.grid.nearest(self.points, event.x, event.y, PICK_RADIUS)
+        self.frame_stats.reset()
         if self.selected_point is None:
-            self.points.append((event.x, event.y))
-            self.redraw()
+            self.add_point(event.x, event.y)
 
     def on_drag(self, event):
         """Перемещение выбранной точки"""
         if self.selected_point is not None and 0 <= self.selected_point < len(self.points):
-            self.points[self.selected_point] = (event.x, event.y)
-            self.redraw()
+            self.frame_stats.events += 1
+            if self.pending_move is not None:
+                self.frame_stats.dropped += 1
+            self.pending_move = (self.selected_point, event.x, event.y)
+            if self.frame_job is None:
+                self.frame_job = self.root.after_idle(self.render_frame)
+
+    def render_frame(self):
+        """Один кадр перетаскивания: последнее положение точки"""
+        self.frame_job = None
+        if self.pending_move is None:
+            return
+        index, x, y = self.pending_move
+        self.pending_move = None
+        start = time.perf_counter()
+        if index < len(self.points):
+            self.move_point(index, x, y)
+        self.frame_stats.frame(start, time.perf_counter())
+        self.frame_label.config(text=self.frame_stats.text())
 
     def on_release(self, event):
-        """Сброс выбранной точки"""
+        """Сброс выбранной точки; длина кривой обновляется после перетаскивания.
+
+        Отложенный кадр с последним положением точки выполняется сразу, иначе
+        длина считалась бы по старому положению.
+        """
+        if self.selected_point is not None:
+            if self.frame_job is not None:
+                self.root.after_cancel(self.frame_job)
+            self.render_frame()
+            self.update_length()
         self.selected_point = None
 
     def redraw(self):
+        """Полная перерисовка: при смене типа кривой или допуска"""
         self.canvas.delete("all")
-        for x, y in self.points:
-            self.canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill="red")
-
-        if self.current_curve == "bezier":
-            self.draw_bezier()
-        elif self.current_curve == "hermite":
-            self.draw_hermite()
-        elif self.current_curve == "bspline":
-            self.draw_bspline()
-
-    def draw_bezier(self):
-        if len(self.points) < 4:
-            return
-        step = 100
-        for i in range(len(self.points) - 3):
-            p0, p1, p2, p3 = self.points[i:i+4]
-            for t in np.linspace(0, 1, step):
-                x, y = self.bezier_point(p0, p1, p2, p3, t)
-                self.canvas.create_oval(x, y, x+1, y+1, fill="black")
-
-    def bezier_point(self, p0, p1, p2, p3, t):
-        M = np.array([
-            [-1,  3, -3, 1],
-            [ 3, -6,  3, 0],
-            [-3,  3,  0, 0],
-            [ 1,  0,  0, 0]
-        ])
-        T = np.array([t**3, t**2, t, 1])
-        P = np.array([p0, p1, p2, p3])
-        return T @ M @ P
-
-    def draw_hermite(self):
-        if len(self.points) < 4:
-            return
-        step = 100
-        for i in range(0, len(self.points) - 3, 3):
-            p0, p1, p2, p3 = self.points[i:i+4]
-            for t in np.linspace(0, 1, step):
-                x, y = self.hermite_point(p0, p1, p2, p3, t)
-                self.canvas.create_oval(x, y, x+1, y+1, fill="blue")
-
-    def hermite_point(self, p0, p1, p2, p3, t):
-        h1 = 2 * t**3 - 3 * t**2 + 1
-        h2 = -2 * t**3 + 3 * t**2
-        h3 = t**3 - 2 * t**2 + t
-        h4 = t**3 - t**2
-        x = h1 * p0[0] + h2 * p3[0] + h3 * (p1[0] - p0[0]) + h4 * (p2[0] - p3[0])
-        y = h1 * p0[1] + h2 * p3[1] + h3 * (p1[1] - p0[1]) + h4 * (p2[1] - p3[1])
-        return x, y
-
-    def draw_bspline(self):
-        if len(self.points) < 4:
+        self.point_items = [self.create_point(x, y) for x, y in self.points]
+        self.curve_items = []
+        self.segment_polylines = []
+        self.segment_sizes = []
+        self.drawn_vertices = 0
+        self.source_vertices = 0
+        self.curve_coords = []
+        self.segment_offsets = np.zeros(0, dtype=int)
+        self.arc_lengths.reset(self.current_curve, 0)
+        self.create_segments(segment_starts(self.current_curve, len(self.points)))
+
+    def create_point(self, x, y):
+        return self.canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill="red")
+
+    def add_point(self, x, y):
+        """Новая точка: строятся только появившиеся сегменты"""
+        self.grid.add(len(self.points), x, y)
+        self.points.append((x, y))
+        self.point_items.append(self.create_point(x, y))
+        starts = segment_starts(self.current_curve, len(self.points))
+        self.create_segments(starts[len(self.segment_polylines):])
+
+    def move_point(self, index, x, y):
+        """Перемещение точки: пересчитываются только зависящие от неё сегменты"""
+        self.grid.move(index, self.points[index], (x, y))
+        self.points[index] = (x, y)
+        self.canvas.coords(self.point_items[index], x - 3, y - 3, x + 3, y + 3)
+        starts = affected_segments(self.current_curve, index, len(self.points))
+        if not len(starts):
             return
-        step = 100
-        for i in range(len(self.points) - 3):
-            p0, p1, p2, p3 = self.points[i:i+4]
-            for t in np.linspace(0, 1, step):
-                x, y = self.bspline_point(p0, p1, p2, p3, t)
-                self.canvas.create_oval(x, y, x+1, y+1, fill="green")
-
-    def bspline_point(self, p0, p1, p2, p3, t):
-        B = np.array([
-            [-1,  3, -3,  1],
-            [ 3, -6,  3,  0],
-            [-3,  0,  3,  0],
-            [ 1,  4,  1,  0]
-        ]) / 6
-        T = np.array([t**3, t**2, t, 1])
-        P = np.array([p0, p1, p2, p3])
-        return T @ B @ P
-
-root = tk.Tk()
-app = CurveEditor(root)
-root.mainloop()
+        segments = (starts // STRIDE[self.current_curve]).tolist()
+        for segment, (polyline, size) in zip(segments, self.build_segments(starts)):
+            self.drawn_vertices += (len(polyline) - len(self.segment_polylines[segment])) // 2
+            self.source_vertices += size - self.segment_sizes[segment]
+            self.segment_polylines[segment] = polyline
+            self.segment_sizes[segment] = size
+        self.arc_lengths.invalidate(segments)
+        self.show_curve(segments)
+
+    def build_segments(self, starts):
+        """Упрощённые ломаные сегментов starts и число точек до упрощения.
+
+        Считаются по соседним точкам, без копирования всего списка.
+        """
+        first = int(starts[0])
+        window = self.points[first:int(starts[-1]) + 4]
+        polylines = tessellate(bezier_controls(self.current_curve, window, starts - first), self.tolerance)
+        return [(simplify(polyline, self.simplify_tolerance).ravel().tolist(), len(polyline))
+                for polyline in polylines]
+
+    def create_segments(self, starts):
+        first = len(self.segment_polylines)
+        if len(starts):
+            for polyline, size in self.build_segments(starts):
+                self.segment_polylines.append(polyline)
+                self.segment_sizes.append(size)
+                self.drawn_vertices += len(polyline) // 2
+                self.source_vertices += size
+        self.arc_lengths.resize(len(self.segment_polylines))
+        self.show_curve(range(first, len(self.segment_polylines)))
+        self.update_length()
+
+    def show_curve(self, segments):
+        """Вывод изменённых сегментов: непрерывная кривая - одна ломаная целиком"""
+        color = CURVE_COLORS[self.current_curve]
+        if self.current_curve in CONTINUOUS:
+            if len(segments):
+                self.splice_curve(segments[0], segments[-1] + 1)
+                if self.curve_items:
+                    self.canvas.coords(self.curve_items[0], self.curve_coords)
+                else:
+                    self.curve_items.append(self.canvas.create_line(self.curve_coords, fill=color))
+        else:
+            for segment in segments:
+                if segment < len(self.curve_items):
+                    self.canvas.coords(self.curve_items[segment], self.segment_polylines[segment])
+                else:
+                    self.curve_items.append(self.canvas.create_line(self.segment_polylines[segment], fill=color))
+        self.update_samples()
+
+    def splice_curve(self, lo, hi):
+        """Замена сегментов lo..hi-1 в общем списке координат непрерывной кривой.
+
+        Начало каждого следующего сегмента совпадает с концом предыдущего,
+        поэтому от него берутся координаты без первой точки. Остальная часть
+        списка не собирается заново, у последующих сегментов сдвигается смещение.
+        """
+        parts = [self.segment_polylines[segment][2 if segment else 0:] for segment in range(lo, hi)]
+        sizes = np.array([len(part) for part in parts])
+        count = len(self.segment_offsets)
+        start = int(self.segment_offsets[lo]) if lo < count else len(self.curve_coords)
+        end = int(self.segment_offsets[hi]) if hi < count else len(self.curve_coords)
+        self.curve_coords[start:end] = [value for part in parts for value in part]
+        offsets = start + np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        tail = self.segment_offsets[hi:] + (int(sizes.sum()) - (end - start))
+        self.segment_offsets = np.concatenate([self.segment_offsets[:lo], offsets, tail])
+
+    def update_samples(self):
+        """Сколько вершин выводится против адаптивного разбиения и равномерного шага"""
+        fixed = len(self.segment_sizes) * self.step
+        drawn = self.drawn_vertices
+        if self.current_curve in CONTINUOUS and drawn:
+            drawn -= len(self.segment_polylines) - 1  # Общие точки стыков
+        ratio = f", в {fixed / drawn:.1f} раза меньше" if drawn else ""
+        self.samples_label.config(text=f"Вершин: {drawn} (до упрощения {self.source_vertices}, "
+                                       f"шаг {self.step}: {fixed}{ratio})")
+
+    def update_length(self):
+        """Длина кривой; при перетаскивании не каждый кадр, а после отпускания"""
+        self.length_label.config(text=f"Длина: {self.arc_lengths.total(self.points):.0f} пикс.")
+
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = CurveEditor(root)
+    root.mainloop()
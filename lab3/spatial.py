@@ -0,0 +1,50 @@
+from collections import defaultdict
+
+
+class PointGrid:
+    """Равномерная сетка опорных точек для выбора ближайшей к курсору.
+
+    Сторона ячейки равна радиусу выбора, поэтому кандидаты лежат в 3x3
+    ячейках вокруг курсора и поиск в среднем стоит O(1).
+    """
+
+    def __init__(self, cell=10):
+        self.cell = cell
+        self.cells = defaultdict(set)
+
+    def key(self, x, y):
+        return int(x // self.cell), int(y // self.cell)
+
+    def add(self, index, x, y):
+        self.cells[self.key(x, y)].add(index)
+
+    def remove(self, index, x, y):
+        key = self.key(x, y)
+        bucket = self.cells.get(key)
+        if bucket is not None:
+            bucket.discard(index)
+            if not bucket:
+                del self.cells[key]
+
+    def move(self, index, old, new):
+        """Перенос точки index из old = (x, y) в new = (x, y)"""
+        if self.key(*old) != self.key(*new):
+            self.remove(index, *old)
+            self.add(index, *new)
+
+    def clear(self):
+        self.cells.clear()
+
+    def nearest(self, points, x, y, radius):
+        """Ближайшая точка с расстоянием меньше radius; при равенстве - с меньшим номером"""
+        cx, cy = self.key(x, y)
+        reach = -(-radius // self.cell)  # Ячеек в каждую сторону
+        best, best_dist = None, radius * radius
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                for index in self.cells.get((i, j), ()):
+                    px, py = points[index]
+                    dist = (px - x) ** 2 + (py - y) ** 2
+                    if dist < best_dist or (dist == best_dist and best is not None and index < best):
+                        best, best_dist = index, dist
+        return best
@@ -0,0 +1,131 @@
+"""Замеры каркасного рендера lab4 без окна (SDL_VIDEODRIVER=dummy).
+
+    python benchmark.py edges --counts 100 10000 1000000
+    python benchmark.py pipeline --sizes 100000 1000000 4000000
+
+edges - кадров в секунду при отрисовке рёбер прежним циклом по
+pygame.draw.line и пакетной растеризацией в зависимости от числа рёбер.
+pipeline - время кадра и пиковая память преобразования вершин прежним
+путём (float64, apply_transformation + project) и сквозным конвейером.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from pipeline import Pipeline
+from transformations import apply_transformation, perspective_matrix, rotation_matrix_x, rotation_matrix_y
+from wireframe import draw_wireframe, to_screen
+
+WIDTH, HEIGHT = 800, 600
+WHITE = (255, 255, 255)
+
+
+def grid_wireframe(n_edges):
+    """Плоская сетка примерно из n_edges рёбер во весь экран, координаты проекции"""
+    side = max(2, int(np.sqrt(n_edges / 2)) + 1)
+    y, x = np.divmod(np.arange(side * side), side)
+    projected = np.stack([(x / (side - 1) - 0.5) * (WIDTH - 40), (y / (side - 1) - 0.5) * (HEIGHT - 40)], axis=1)
+    index = np.arange(side * side).reshape(side, side)
+    horizontal = np.stack([index[:, :-1].ravel(), index[:, 1:].ravel()], axis=1)
+    vertical = np.stack([index[:-1].ravel(), index[1:].ravel()], axis=1)
+    return projected, np.vstack([horizontal, vertical])[:n_edges]
+
+
+def draw_loop(surface, projected, edges):
+    """Прежний draw_edges: pygame.draw.line на каждое ребро"""
+    for edge in edges:
+        p1 = projected[edge[0]]
+        p2 = projected[edge[1]]
+        pygame.draw.line(surface, WHITE, (p1[0] + WIDTH // 2, -p1[1] + HEIGHT // 2),
+                         (p2[0] + WIDTH // 2, -p2[1] + HEIGHT // 2), 2)
+
+
+def draw_batched(surface, projected, edges):
+    draw_wireframe(surface, to_screen(projected, WIDTH, HEIGHT), edges, WHITE, 2)
+
+
+def fps(draw, surface, projected, edges, min_time=0.5):
+    frames, total = 0, 0.0
+    while total < min_time:
+        surface.fill((0, 0, 0))
+        start = time.perf_counter()
+        draw(surface, projected, edges)
+        total += time.perf_counter() - start
+        frames += 1
+    return frames / total
+
+
+def run_edges(counts, loop_limit=100_000):
+    pygame.init()
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    for count in counts:
+        projected, edges = grid_wireframe(count)
+        batched = fps(draw_batched, surface, projected, edges)
+        line = f"edges={len(edges):<8} batched: {batched:9.1f} fps"
+        if count <= loop_limit:
+            loop = fps(draw_loop, surface, projected, edges)
+            line += f"  draw.line loop: {loop:9.1f} fps  speedup: {batched / loop:6.1f}x"
+        print(line)
+    pygame.quit()
+
+
+def project(points, distance=5):
+    """Прежняя проекция из main.py: отдельное умножение и деление на w"""
+    projected = apply_transformation(points, perspective_matrix(distance))
+    projected[:, :2] /= projected[:, 3].reshape(-1, 1)
+    return projected[:, :2]
+
+
+def frame_cost(frame, frames=10):
+    """Медианное время кадра и наибольший пик памяти за кадр после прогрева"""
+    frame(0)
+    times, peak = [], 0
+    for i in range(frames):
+        tracemalloc.start()
+        start = time.perf_counter()
+        frame(i)
+        times.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return float(np.median(times)), peak
+
+
+def run_pipeline(sizes, distance=5):
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        points = np.ones((size, 4))
+        points[:, :3] = rng.uniform(-1, 1, size=(size, 3))
+
+        def model(i):
+            return rotation_matrix_y(0.05 * i) @ rotation_matrix_x(0.03 * i)
+
+        old_time, old_peak = frame_cost(
+            lambda i: to_screen(project(apply_transformation(points, model(i)), distance), WIDTH, HEIGHT))
+
+        pipeline = Pipeline(points[:, :3], WIDTH, HEIGHT, distance)
+        buffers = pipeline.points.nbytes + pipeline.clip.nbytes + pipeline.screen.nbytes
+        new_time, new_peak = frame_cost(lambda i: pipeline.frame(model(i)))
+        print(f"vertices={size:<8} old: {old_time * 1000:8.2f} ms/frame, peak {old_peak / 2**20:8.1f} MiB | "
+              f"fused: {new_time * 1000:8.2f} ms/frame, peak {new_peak / 2**10:6.1f} KiB "
+              f"(buffers {buffers / 2**20:.1f} MiB) | speedup {old_time / new_time:5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замеры каркасного рендера")
+    commands = parser.add_subparsers(dest="command", required=True)
+    edges = commands.add_parser("edges", help="кадры в секунду в зависимости от числа рёбер")
+    edges.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10_000, 100_000, 1_000_000])
+    pipe = commands.add_parser("pipeline", help="время кадра и память преобразования вершин")
+    pipe.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 4_000_000])
+    args = parser.parse_args()
+
+    if args.command == "edges":
+        run_edges(args.counts)
+    elif args.command == "pipeline":
+        run_pipeline(args.sizes)
@@ -1,7 +1,12 @@
+import sys
+
 import pygame
 import tkinter as tk
 from tkinter import ttk
 from transformations import *
+from mesh import load_mesh
+from pipeline import Pipeline
+from wireframe import draw_wireframe
 
 # Настройки окна
 WIDTH, HEIGHT = 800, 600
@@ -19,39 +24,14 @@ OBJECT_FILES = {
     "Призма": "prism.txt"
 }
 
-# Ребра для разных фигур
-EDGES_MAP = {
-    "cube.txt": [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)],
-    "pyramid.txt": [(0, 1), (0, 2), (0, 3), (0, 4), (1, 2), (2, 3), (3, 4), (4, 1)],
-    "tetrahedron.txt": [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)],
-    "prism.txt": [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)]
-}
-
-
 def load_object(filename):
-    """Загружает координаты 3D объекта из файла"""
-    points = []
-    with open(filename, 'r') as f:
-        for line in f:
-            x, y, z = map(float, line.split())
-            points.append([x, y, z, 1])  # Однородные координаты
-    return np.array(points)
-
-
-def project(points):
-    """Проецирует 3D точки на 2D"""
-    projected = apply_transformation(points, perspective_matrix(distance))
-    projected[:, :2] /= projected[:, 3].reshape(-1, 1)  # Деление на w
-    return projected[:, :2]  # Возвращаем только x, y
+    """Загружает 3D объект: вершины (n, 3) и рёбра по граням"""
+    return load_mesh(filename)
 
 
-def draw_edges(screen, projected, edges):
-    """Рисует ребра объекта"""
-    for edge in edges:
-        p1 = projected[edge[0]]
-        p2 = projected[edge[1]]
-        pygame.draw.line(screen, WHITE, (p1[0] + WIDTH // 2, -p1[1] + HEIGHT // 2),
-                         (p2[0] + WIDTH // 2, -p2[1] + HEIGHT // 2), 2)
+def draw_edges(screen, screen_points, edges):
+    """Рисует ребра объекта по экранным координатам вершин, пакетом"""
+    draw_wireframe(screen, screen_points, edges, WHITE, 2)
 
 
 def choose_object():
@@ -84,10 +64,11 @@ def main():
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     clock = pygame.time.Clock()
 
-    # Выбор фигуры через GUI
-    obj_file = choose_object()
-    points = load_object(obj_file)
-    edges = EDGES_MAP[obj_file]
+    # Выбор фигуры через GUI или файл сетки из командной строки
+    obj_file = sys.argv[1] if len(sys.argv) > 1 else choose_object()
+    vertices, edges = load_object(obj_file)
+    pipeline = Pipeline(vertices, WIDTH, HEIGHT, distance)
+    del vertices  # Вершины остаются только в буфере конвейера
 
     transform = np.eye(4)  # Начальная матрица преобразований
     mirror_delay = 300
@@ -97,12 +78,11 @@ def main():
     while running:
         screen.fill(BLACK)
 
-        # Применяем трансформацию
-        transformed_points = apply_transformation(points, transform)
-        projected_points = project(transformed_points)
+        # Модель, проекция и перевод на экран - одна матрица на кадр
+        screen_points = pipeline.frame(transform)
 
         # Рисуем объект
-        draw_edges(screen, projected_points, edges)
+        draw_edges(screen, screen_points, edges)
 
         # Обработка событий
         for event in pygame.event.get():
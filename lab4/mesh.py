@@ -0,0 +1,142 @@
+"""Загрузка сеток в формате OBJ: вершины "v x y z" и грани "f i j k ...".
+
+Строки "x y z" без префикса (прежний формат файлов лабораторной) тоже
+читаются как вершины. Рёбра каркаса выводятся из граней. Разобранная сетка
+сохраняется рядом с исходным файлом в .npy и при повторном открытии
+отображается в память (mmap), а не разбирается заново.
+
+Запуск как скрипта - замер разбора и повторного открытия большой сетки:
+    python mesh.py --size 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def parse_obj(path):
+    """Вершины (n, 3) и рёбра (m, 2) из текстового файла сетки.
+
+    Строки только раскладываются по спискам; числа из них переводятся
+    разом средствами NumPy.
+    """
+    vertices = []
+    tokens_f = []  # Индексы всех граней подряд, как в файле
+    sizes = []
+    seen = []  # Сколько вершин было прочитано к каждой грани
+    with open(path) as f:
+        for line in f:
+            tokens = line.split()
+            if not tokens or tokens[0].startswith("#"):
+                continue
+            kind = tokens[0]
+            if kind == "v":
+                vertices.append(tokens[1:4])
+            elif kind == "f":
+                tokens_f.extend(tokens[1:])
+                sizes.append(len(tokens) - 1)
+                seen.append(len(vertices))
+            elif kind[0] in "+-.0123456789":
+                vertices.append(tokens[:3])
+            # Нормали, текстурные координаты, группы и материалы не нужны каркасу
+
+    vertices = np.array(vertices, dtype=float).reshape(-1, 3)
+    sizes = np.array(sizes, dtype=np.int64)
+    # "i/t/n" -> i; индексы с 1, отрицательные отсчитываются от последней вершины
+    indices = np.array([token.partition("/")[0] for token in tokens_f] if any("/" in t for t in tokens_f)
+                       else tokens_f, dtype=np.int64).reshape(-1)
+    indices = np.where(indices > 0, indices - 1, np.repeat(np.array(seen, dtype=np.int64), sizes) + indices)
+    if len(indices) and (indices.min() < 0 or indices.max() >= len(vertices)):
+        raise ValueError(f"{path}: грань ссылается на несуществующую вершину")
+    return vertices, face_edges(indices, sizes)
+
+
+def face_edges(indices, sizes):
+    """Уникальные рёбра по граням: грань из k вершин даёт k рёбер по контуру.
+
+    indices - вершины всех граней подряд, sizes - число вершин в каждой.
+    Ребро общее у соседних граней, поэтому пары упорядочиваются (меньший
+    номер первым), кодируются одним int64 и прореживаются через np.unique.
+    """
+    sizes = sizes[sizes > 0]
+    if not len(indices):
+        return np.zeros((0, 2), dtype=np.int64)
+    starts = np.cumsum(sizes) - sizes
+    following = np.arange(1, len(indices) + 1)
+    following[starts + sizes - 1] = starts  # Последняя вершина грани замыкается на первую
+    a, b = indices, indices[following]
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    proper = lo != hi
+    n = int(indices.max()) + 1
+    keys = np.unique(lo[proper] * n + hi[proper])
+    return np.stack(np.divmod(keys, n), axis=1)
+
+
+def sidecar_paths(path):
+    return path + ".vertices.npy", path + ".edges.npy"
+
+
+def is_fresh(path, *cached):
+    """Кэш есть и записан не раньше исходного файла"""
+    try:
+        source = os.stat(path).st_mtime_ns
+        return all(os.stat(c).st_mtime_ns >= source for c in cached)
+    except OSError:
+        return False
+
+
+def save_array(path, array):
+    """Запись .npy через временный файл, чтобы не оставить обрезанный кэш"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_mesh(path, cache=True):
+    """Вершины и рёбра сетки; повторное открытие читает .npy рядом с файлом через mmap"""
+    vertices_path, edges_path = sidecar_paths(path)
+    if cache and is_fresh(path, vertices_path, edges_path):
+        return np.load(vertices_path, mmap_mode="r"), np.load(edges_path, mmap_mode="r")
+    vertices, edges = parse_obj(path)
+    if cache:
+        try:
+            save_array(vertices_path, vertices)
+            save_array(edges_path, edges)
+        except OSError:
+            pass  # Каталог только для чтения: работаем без кэша
+    return vertices, edges
+
+
+def write_grid(path, size):
+    """Тестовая сетка size x size вершин из четырёхугольных граней"""
+    y, x = np.divmod(np.arange(size * size), size)
+    vertices = np.stack([x, y, np.sin(x / 10) * np.cos(y / 10)], axis=1)
+    corner = (np.arange(size - 1)[:, None] * size + np.arange(size - 1)).ravel() + 1
+    faces = np.stack([corner, corner + 1, corner + size + 1, corner + size], axis=1)
+    with open(path, "w") as f:
+        np.savetxt(f, vertices, fmt="v %.6g %.6g %.6g")
+        np.savetxt(f, faces, fmt="f %d %d %d %d")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Разбор сетки и повторное открытие из кэша")
+    parser.add_argument("--size", type=int, default=2000, help="сторона тестовой сетки в вершинах")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "grid.obj")
+        write_grid(path, args.size)
+        for label in ("parse", "reopen"):
+            start = time.perf_counter()
+            vertices, edges = load_mesh(path)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<6} {len(vertices)} vertices, {len(edges)} edges: {elapsed:.3f} s")
+        del vertices, edges
@@ -0,0 +1,53 @@
+"""Сквозное преобразование вершин: модель, проекция и экран одной матрицей.
+
+За кадр перемножаются только матрицы 4x4; вершины проходят одно
+умножение и деление на w в float32, результат пишется в буферы,
+выделенные один раз при создании конвейера, так что в установившемся
+режиме кадр не выделяет памяти под вершины.
+"""
+import numpy as np
+
+from transformations import perspective_matrix
+
+
+def viewport_matrix(width, height):
+    """Перевод в экранные координаты до деления на w: начало в центре, y вверх"""
+    return np.array([
+        [1,  0, 0, width // 2],
+        [0, -1, 0, height // 2],
+        [0,  0, 1, 0],
+        [0,  0, 0, 1]
+    ], dtype=float)
+
+
+class Pipeline:
+    """Конвейер преобразования вершин сетки в экранные координаты.
+
+    Координаты хранятся по строкам, (4, n): так и умножение на матрицу, и
+    деление на w идут по непрерывным строкам без промежуточных буферов.
+    Принимает вершины (n, 3) и сам заполняет однородные координаты - сетка
+    хранится только в этом буфере, без второй копии у вызывающего.
+    """
+
+    def __init__(self, vertices, width, height, distance):
+        vertices = np.asarray(vertices)
+        self.points = np.ones((4, len(vertices)), dtype=np.float32)
+        self.points[:3] = vertices.T
+        self.view_projection = viewport_matrix(width, height) @ perspective_matrix(distance)
+        self.mvp = np.empty((4, 4))
+        self.mvp32 = np.empty((4, 4), dtype=np.float32)
+        self.clip = np.empty(self.points.shape, dtype=np.float32)
+        self.screen = np.empty((2, self.points.shape[1]), dtype=np.float32)
+
+    def frame(self, model):
+        """Экранные координаты вершин (n, 2) для матрицы модели model.
+
+        Возвращает представление буфера конвейера: следующий кадр его перезапишет.
+        """
+        np.matmul(self.view_projection, model, out=self.mvp)
+        self.mvp32[...] = self.mvp
+        np.matmul(self.mvp32, self.points, out=self.clip)
+        np.divide(self.clip[:2], self.clip[3], out=self.screen)
+        # pygame.draw.line отбрасывает дробную часть координат - делаем так же
+        np.trunc(self.screen, out=self.screen)
+        return self.screen.T
@@ -0,0 +1,97 @@
+"""Пакетная отрисовка каркаса: все рёбра растеризуются NumPy за один проход.
+
+Перевод в экранные координаты делается один раз для всех вершин, рёбра
+отсекаются по окну (Лиан-Барски) и раскладываются в пиксели алгоритмом
+ЦДА, после чего пиксели записываются в поверхность pygame через
+surfarray одним присваиванием.
+"""
+import numpy as np
+import pygame
+
+# Сколько рёбер растеризуется за раз, чтобы ограничить память
+CHUNK = 1 << 16
+# Меньше этого числа рёбер вызовы pygame.draw.line обходятся дешевле пакета
+BATCH_MIN = 2000
+
+
+def to_screen(projected, width, height):
+    """Экранные координаты вершин: начало в центре окна, ось y направлена вверх"""
+    screen = np.empty((len(projected), 2))
+    np.add(projected[:, 0], width // 2, out=screen[:, 0])
+    np.subtract(height // 2, projected[:, 1], out=screen[:, 1])
+    # pygame.draw.line отбрасывает дробную часть координат - делаем так же
+    np.trunc(screen, out=screen)
+    return screen
+
+
+def clip(segments, width, height):
+    """Отсечение отрезков (N, 4) по окну алгоритмом Лиана-Барски; возвращает видимые.
+
+    Отрезки, целиком лежащие в окне (обычный случай), не пересчитываются.
+    """
+    x1, y1, x2, y2 = segments.T
+    inside = ((np.minimum(x1, x2) >= 0) & (np.maximum(x1, x2) <= width - 1)
+              & (np.minimum(y1, y2) >= 0) & (np.maximum(y1, y2) <= height - 1))
+    if inside.all():
+        return segments
+    rest = segments[~inside]
+    x1, y1, x2, y2 = rest.T
+    dx, dy = x2 - x1, y2 - y1
+    t0 = np.zeros(len(rest))
+    t1 = np.ones(len(rest))
+    visible = np.isfinite(rest).all(axis=1)
+    for p, q in ((-dx, x1), (dx, width - 1 - x1), (-dy, y1), (dy, height - 1 - y1)):
+        parallel = p == 0
+        visible &= ~(parallel & (q < 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = q / p
+        t0 = np.where(~parallel & (p < 0), np.maximum(t0, r), t0)
+        t1 = np.where(~parallel & (p > 0), np.minimum(t1, r), t1)
+    visible &= t0 <= t1
+    t0, t1 = t0[visible, None], t1[visible, None]
+    start, delta = rest[visible, :2], rest[visible, 2:] - rest[visible, :2]
+    return np.vstack([segments[inside], np.hstack([start + t0 * delta, start + t1 * delta])])
+
+
+def rasterize(segments, width=1):
+    """Пиксели отрезков (N, 4) алгоритмом ЦДА; толщина width поперёк основной оси.
+
+    Отрезки уже отсечены по окну, так что координаты и номера шагов
+    умещаются в 32 бита: вдвое меньше памяти на каждый пиксель.
+    """
+    x1, y1, x2, y2 = segments.astype(np.float32).T
+    dx, dy = x2 - x1, y2 - y1
+    steps = np.ceil(np.maximum(np.abs(dx), np.abs(dy))).astype(np.int32)
+    counts = steps + 1
+    k = np.repeat(np.arange(len(segments), dtype=np.int32), counts)
+    i = np.arange(counts.sum(), dtype=np.int32) - np.repeat(np.cumsum(counts, dtype=np.int32) - counts, counts)
+    t = i / np.maximum(steps, 1).astype(np.float32)[k]
+    xs = np.floor(x1[k] + t * dx[k] + 0.5).astype(np.int32)
+    ys = np.floor(y1[k] + t * dy[k] + 0.5).astype(np.int32)
+    if width > 1:
+        # Как у pygame.draw.line: пологие линии утолщаются по y, крутые по x
+        steep = (np.abs(dy) > np.abs(dx))[k]
+        offsets = np.arange(width, dtype=np.int32) - width // 2
+        xs = (xs[:, None] + offsets * steep[:, None]).ravel()
+        ys = (ys[:, None] + offsets * ~steep[:, None]).ravel()
+    return xs, ys
+
+
+def draw_wireframe(surface, screen, edges, color, width=1):
+    """Рисует рёбра edges (M, 2) между вершинами screen (N, 2) на поверхности"""
+    if len(edges) < BATCH_MIN:
+        for a, b in np.asarray(edges).tolist():
+            pygame.draw.line(surface, color, screen[a].tolist(), screen[b].tolist(), width)
+        return
+    w, h = surface.get_size()
+    value = surface.map_rgb(color)
+    pixels = pygame.surfarray.pixels2d(surface)
+    try:
+        for start in range(0, len(edges), CHUNK):
+            chunk = np.asarray(edges[start:start + CHUNK])
+            segments = clip(np.hstack([screen[chunk[:, 0]], screen[chunk[:, 1]]]), w, h)
+            xs, ys = rasterize(segments, width)
+            inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+            pixels[xs[inside], ys[inside]] = value
+    finally:
+        del pixels  # Снимает блокировку поверхности